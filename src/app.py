@@ -1,50 +1,301 @@
 import cv2
+import hmac
+import importlib
+import json
+import os
 import numpy as np
+import queue
 import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
 from flask import Flask, render_template, Response, jsonify
 
 app = Flask(__name__)
 
-# --- Global State ---
-output_text = ""
-last_predicted_label = None
-frame_count = 0
-THRESHOLD_FRAMES = 15
+import uuid
+from .labels import labels
+from . import config
+from .model_manager import ModelManager
+from .session import RecognitionSession
+from .smoothing import TemporalSmoother
+from .state_backend import create_state_backend
+
+# --- Sessions ---
+def new_smoother():
+    return TemporalSmoother(
+        len(labels),
+        mode=config.SMOOTHING_MODE,
+        window=config.SMOOTHING_WINDOW,
+        alpha=config.SMOOTHING_ALPHA,
+        threshold=config.COMMIT_THRESHOLD,
+        dwell_ms=config.COMMIT_DWELL_MS
+    )
+
+def new_stream():
+    return sequence_model.new_stream() if sequence_model is not None else None
+
+# Transcript, trackers and game state per client, keyed by session ID, loaded
+# once per request through the configured state backend and saved only when
+# the request changed them
+SESSION_COOKIE = 'signdecode_session'
+state_backend = create_state_backend(
+    config.STATE_BACKEND,
+    lambda: RecognitionSession(new_smoother, max_text_length=config.MAX_TEXT_LENGTH,
+                               stream_factory=new_stream, decoder=word_decoder),
+    redis_url=config.REDIS_URL,
+    max_sessions=config.MAX_SESSIONS,
+    ttl_seconds=config.SESSION_TTL_SECONDS,
+    max_bytes=int(config.SESSION_MEMORY_MB * 1024 * 1024)
+)
+
+def current_session():
+    """
+    Returns the caller's RecognitionSession, identified by the X-Session-ID
+    header, the session_id query parameter or the session cookie. Callers
+    without an ID get a new session and a cookie.
+    """
+    from flask import request, g
+    if 'recognition_session' in g:
+        return g.recognition_session
+    session_id = (request.headers.get('X-Session-ID') or request.args.get('session_id')
+                  or request.cookies.get(SESSION_COOKIE))
+    if not session_id or len(session_id) > 64:
+        session_id = uuid.uuid4().hex
+        g.new_session_id = session_id
+    g.session_id = session_id
+    g.recognition_session = state_backend.load(session_id)
+    return g.recognition_session
+
+def save_if_changed(session_id, session):
+    """
+    Writes the session back when it has unsaved changes. Read-only requests
+    (/status, /events, polling) never save, so they cannot undo a commit
+    another worker saved meanwhile.
+    """
+    with session.lock:
+        if session.dirty:
+            state_backend.save(session_id, session)
+            session.dirty = False
+
+@app.after_request
+def save_session(response):
+    from flask import g
+    if 'recognition_session' in g:
+        save_if_changed(g.session_id, g.recognition_session)
+        response.headers['X-Session-ID'] = g.session_id
+        if 'new_session_id' in g:
+            response.set_cookie(SESSION_COOKIE, g.session_id, httponly=True, samesite='Lax')
+    return response
 
 # --- Game State ---
-current_target_sign = None
-game_score = 0
-import random
-from .labels import labels
 available_signs = list(labels.values()) if labels else []
 
 # --- MediaPipe & Model (Lazy Loaded) ---
-hands = None
-model = None
+hands_pool = None
+model_manager = ModelManager(config.MODEL_PATH, config.MODEL_BACKEND, config.WARMUP_BATCH_SIZES)
 mp_draw = None
 mp_hands = None
-extract_keypoints = None
+extract_keypoints_batch = None
+hand_labels = None
+batcher = None
+sequence_model = None  # optional streaming model for motion signs (J, Z)
+dynamic_indices = [i for i, char in labels.items() if char in config.SEQUENCE_LABELS]
+word_decoder = None  # optional lexicon decoder, sessions created before it loads spell raw letters
+
+# --- Readiness ---
+# Per-component load times (ms) and errors, reported by /readyz
+startup = {'components': {}, 'errors': {}}
+ready_event = threading.Event()
+model_event = threading.Event()
+
+@contextmanager
+def timed_component(name):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        startup['errors'][name] = str(e)
+        raise
+    finally:
+        startup['components'][name] = round((time.perf_counter() - start) * 1000.0, 1)
 
 def init_ai():
-    global hands, model, mp_draw, mp_hands, extract_keypoints
+    global hands_pool, mp_draw, mp_hands, extract_keypoints_batch, hand_labels, batcher, sequence_model, word_decoder
     try:
-        import mediapipe as mp
-        from .utils import extract_keypoints as ex_kp
+        with timed_component('mediapipe_import'):
+            import mediapipe as mp
+            from .utils import extract_keypoints_batch as ex_kp, hand_labels as hd_lb
         mp_hands = mp.solutions.hands
         mp_draw = mp.solutions.drawing_utils
-        extract_keypoints = ex_kp
-        hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7)
+        extract_keypoints_batch = ex_kp
+        hand_labels = hd_lb
+        from .hands_pool import HandsPool
+        pool = HandsPool(
+            lambda: mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7),
+            size=config.HANDS_POOL_SIZE,
+            timeout=config.HANDS_POOL_TIMEOUT_SECONDS
+        )
+        with timed_component('hands_construct'):
+            pool.prewarm(config.HANDS_POOL_PREWARM)
+        hands_pool = pool
         print("✅ MediaPipe and Utils initialized.")
     except Exception as e:
         print(f"⚠️ AI Components failed: {e}")
 
     try:
-        from tensorflow.keras.models import load_model
-        model = load_model("models/sign_language_model.h5")
-        print("✅ Model loaded successfully.")
+        from .model import compare_backends
+        if config.MODEL_BACKEND == "keras":
+            # Only the Keras backend needs the full TensorFlow import
+            with timed_component('tf_import'):
+                importlib.import_module("tensorflow")
+        try:
+            model_manager.reload(force=True)
+        except Exception as e:
+            startup['errors']['model_load'] = str(e)
+            raise
+        startup['components'].update(model_manager.load_timings)
+        print(f"✅ Model {model_manager.current.version} loaded successfully ({config.MODEL_BACKEND} backend).")
+        print(f"✅ Warm-up: {model_manager.format_warmup()}")
+        if config.VERIFY_BACKEND and config.MODEL_BACKEND != "keras":
+            max_diff, agreement = compare_backends(config.MODEL_PATH, backend=config.MODEL_BACKEND)
+            print(f"✅ Backend check vs Keras: max diff {max_diff:.2e}, argmax agreement {agreement:.1%}")
+        if config.BATCHING_ENABLED:
+            from .batching import MicroBatcher
+            batcher = MicroBatcher(model_manager.predict_batch, max_batch_size=config.BATCH_MAX_SIZE,
+                                   max_wait_ms=config.BATCH_WINDOW_MS)
+            print(f"✅ Micro-batching enabled (max {config.BATCH_MAX_SIZE} rows, {config.BATCH_WINDOW_MS} ms window).")
     except Exception as e:
         print(f"⚠️ Model not found or error loading: {e}")
 
+    if config.SEQUENCE_MODEL_PATH and os.path.exists(config.SEQUENCE_MODEL_PATH):
+        try:
+            from .sequence import SequenceModel
+            with timed_component('sequence_model_load'):
+                model = SequenceModel(config.SEQUENCE_MODEL_PATH)
+            if model.num_classes != len(labels):
+                raise ValueError(f"it has {model.num_classes} outputs, expected {len(labels)}")
+            sequence_model = model
+            print(f"✅ Sequence model loaded ({sequence_model.window}-frame window).")
+        except Exception as e:
+            print(f"⚠️ Sequence model not loaded, motion signs disabled: {e}")
+
+    if config.LEXICON_PATH:
+        try:
+            from .decoder import Lexicon, BeamDecoder
+            with timed_component('lexicon_load'):
+                lexicon = Lexicon.load(config.LEXICON_PATH, [labels[i] for i in range(len(labels))],
+                                       order=config.NGRAM_ORDER)
+            word_decoder = BeamDecoder(lexicon, beam_width=config.BEAM_WIDTH, lm_weight=config.LM_WEIGHT,
+                                       word_gap_ms=config.WORD_GAP_MS)
+            print(f"✅ Lexicon decoder loaded ({lexicon.terminal.sum()} words, {lexicon.nbytes() // 1024} KiB).")
+        except Exception as e:
+            print(f"⚠️ Lexicon not loaded, transcript is not corrected: {e}")
+
+    model_ready()
+    if is_ready():
+        print(f"✅ Worker ready: {startup['components']}")
+
+    if config.MODEL_RELOAD_INTERVAL > 0:
+        model_manager.watch(config.MODEL_RELOAD_INTERVAL)
+
+def model_ready():
+    # A model that failed at startup may still arrive later through hot reload
+    if not model_event.is_set() and model_manager.current is not None:
+        model_event.set()
+    return model_event.is_set()
+
+def is_ready():
+    if not ready_event.is_set() and hands_pool is not None and model_ready():
+        ready_event.set()
+    return ready_event.is_set()
+
+def _wait_for(check, event, view):
+    """
+    Holds a request for up to READY_WAIT_SECONDS until `check` passes, then
+    answers 503 so load balancers retry elsewhere.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not check() and not event.wait(config.READY_WAIT_SECONDS):
+            response = jsonify({'error': 'Worker is not ready', 'ready': False, 'errors': startup['errors']})
+            response.headers['Retry-After'] = str(config.RETRY_AFTER_SECONDS)
+            return response, 503
+        return view(*args, **kwargs)
+    return wrapper
+
+def requires_ready(view):
+    """
+    For frame endpoints, which need both MediaPipe and the model.
+    """
+    return _wait_for(is_ready, ready_event, view)
+
+def requires_model(view):
+    """
+    For landmark endpoints: the client ran detection, so a worker without
+    MediaPipe serves them as soon as the model is loaded.
+    """
+    return _wait_for(model_ready, model_event, view)
+
+def classify(keypoints):
+    """
+    Returns class probabilities for an (n, 63) keypoint array and the version
+    of the model that produced them, going through the micro-batcher when it
+    is enabled. The batcher reads the live model once per batch, so a hot
+    swap never mixes one model's output with another's version.
+    """
+    if batcher is not None:
+        return batcher.predict(keypoints)
+    return model_manager.predict_batch(keypoints)
+
+def classify_hands(keypoints, handedness, session):
+    """
+    Classifies every hand of a frame in one call, advances each hand's
+    sequence model stream and feeds the probabilities to its temporal
+    smoother. Shared by /process_frame, /predict_landmarks and the WebSocket
+    stream.
+
+    :param keypoints: Array of shape (n_hands, 63)
+    :param handedness: List of n_hands tracker keys ('Left'/'Right')
+    :param session: RecognitionSession receiving the commits
+    :return: (list of per-hand prediction dicts, model version)
+    """
+    prediction, model_version = classify(keypoints)
+
+    # Smoothers, streams, transcript and score change below; concurrent
+    # requests of the same session (WebSocket plus HTTP) take turns
+    with session.lock:
+        predictions = []
+        now = time.time()
+        for hand, hand_keypoints, probabilities in zip(handedness, keypoints, prediction):
+            # Motion signs: the sequence model overrides the per-frame classifier
+            # when it is confident about one of them
+            stream = session.stream(hand) if sequence_model is not None else None
+            if stream is not None:
+                sequence_probabilities = sequence_model.step(stream, hand_keypoints)
+                if sequence_probabilities is not None:
+                    dynamic = int(sequence_probabilities.argmax())
+                    if dynamic in dynamic_indices and sequence_probabilities[dynamic] >= config.SEQUENCE_THRESHOLD:
+                        probabilities = sequence_probabilities
+
+            # Temporal smoothing, one smoother per hand
+            smoother = session.tracker(hand)
+            committed_index = smoother.update(probabilities, now)
+
+            # recognized
+            if committed_index is not None and committed_index in labels:
+                session.commit(labels[committed_index], smoother.average, now)
+
+            session.dirty = True
+            predictions.append({
+                'handedness': hand,
+                'prediction': labels.get(smoother.label, ''),
+                'confidence': smoother.confidence,
+                'dwell_ms': round(smoother.dwell(now), 1),
+                'committed': committed_index is not None
+            })
+    return predictions, model_version
+
 # Call init in a thread to not block Flask startup
 threading.Thread(target=init_ai, daemon=True).start()
 
@@ -53,81 +304,349 @@ threading.Thread(target=init_ai, daemon=True).start()
 
 import base64
 
+def decode_frame(request):
+    """
+    Decodes the uploaded frame without intermediate copies where possible.
+
+    Supported bodies:
+      - image/jpeg (or any image/*): raw encoded bytes
+      - multipart/form-data: encoded bytes in the 'image' file field
+      - application/octet-stream: raw uint8 RGB pixels, sized by the
+        X-Frame-Width / X-Frame-Height headers (for LAN clients)
+      - application/json: {"image": "data:image/jpeg;base64,..."} (legacy)
+
+    :return: (BGR frame, None) or (None, error message)
+    """
+    content_type = request.mimetype or ''
+    try:
+        if content_type.startswith('image/'):
+            encoded = np.frombuffer(request.get_data(cache=False), np.uint8)
+        elif content_type == 'multipart/form-data':
+            upload = request.files.get('image')
+            if upload is None:
+                return None, 'No image file'
+            encoded = np.frombuffer(upload.read(), np.uint8)
+        elif content_type == 'application/octet-stream':
+            width = int(request.headers['X-Frame-Width'])
+            height = int(request.headers['X-Frame-Height'])
+            raw = np.frombuffer(request.get_data(cache=False), np.uint8)
+            if raw.size != width * height * 3:
+                return None, f'Expected {width * height * 3} bytes for {width}x{height} RGB, got {raw.size}'
+            return cv2.cvtColor(raw.reshape(height, width, 3), cv2.COLOR_RGB2BGR), None
+        else:
+            data = request.get_json(silent=True) or {}
+            image_data = data.get('image')
+            if not image_data:
+                return None, 'No image data'
+            header, encoded = image_data.split(",", 1)
+            encoded = np.frombuffer(base64.b64decode(encoded), np.uint8)
+    except Exception as e:
+        return None, str(e)
+
+    if encoded.size == 0:
+        return None, 'No image data'
+    frame = cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+    if frame is None:
+        return None, 'Image decoding failed'
+    return frame, None
+
+def detect_and_classify(frame, session, session_id=None):
+    """
+    Runs hand detection on a (mirrored) BGR frame and classifies every hand found.
+    Raises TimeoutError when no Hands instance frees up in time.
+
+    :param session_id: Key for Hands instance affinity, so tracking follows one user
+    :return: (per-hand prediction dicts, Mediapipe hand landmarks, model version)
+    """
+    predictions = []
+    hand_landmarks_list = []
+    model_version = model_manager.current.version if model_manager.current else None
+    # Safe AI processing
+    if hands_pool and frame is not None:
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        with hands_pool.checkout(session_id) as hands:
+            try:
+                results = hands.process(rgb_frame)
+            except Exception as e:
+                print(f"Processing error: {e}")
+                return predictions, hand_landmarks_list, model_version
+
+        if results.multi_hand_landmarks:
+            hand_landmarks_list = results.multi_hand_landmarks
+
+            # Predict all hands of the frame in one call if model and extract_keypoints exist
+            if model_manager.current and extract_keypoints_batch:
+                try:
+                    keypoints = extract_keypoints_batch(results.multi_hand_landmarks)
+                    predictions, model_version = classify_hands(keypoints, hand_labels(results), session)
+                except Exception as e:
+                    print(f"Processing error: {e}")
+    return predictions, hand_landmarks_list, model_version
+
+RESPONSE_MODES = ('full', 'preview', 'landmarks')
+
+def response_options(request):
+    """
+    Reads the response mode and encoding options from the query string, so
+    they work with every supported body type.
+
+    :return: (mode, jpeg quality, scale) or raises ValueError
+    """
+    mode = request.args.get('response', 'full')
+    if mode not in RESPONSE_MODES:
+        raise ValueError(f"'response' must be one of {', '.join(RESPONSE_MODES)}")
+    quality = int(request.args.get('quality', config.JPEG_QUALITY))
+    default_scale = config.PREVIEW_SCALE if mode == 'preview' else 1.0
+    scale = float(request.args.get('scale', default_scale))
+    if not 1 <= quality <= 100 or not 0 < scale <= 1:
+        raise ValueError("'quality' must be in 1-100 and 'scale' in (0, 1]")
+    return mode, quality, scale
+
 @app.route('/process_frame', methods=['POST'])
+@requires_ready
 def process_frame():
-    global output_text, last_predicted_label, frame_count, model, hands
+    """
+    Detects and classifies hands in an uploaded frame.
+
+    Query parameters:
+      - response: 'full' (annotated frame, default), 'preview' (downscaled
+        annotated frame) or 'landmarks' (no image, landmark coordinates only)
+      - quality: JPEG quality of the returned image
+      - scale: resize factor of the returned image
+    """
     from flask import request
-    
-    data = request.get_json()
-    image_data = data.get('image')
-    if not image_data:
-        return jsonify({'error': 'No image data'}), 400
 
-    # Decode base64 image
     try:
-        header, encoded = image_data.split(",", 1)
-        data = base64.b64decode(encoded)
-        nparr = np.frombuffer(data, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-    except Exception as e:
+        mode, quality, scale = response_options(request)
+    except ValueError as e:
         return jsonify({'error': str(e)}), 400
 
-    if frame is None:
-        return jsonify({'error': 'Image decoding failed'}), 400
+    frame, error = decode_frame(request)
+    if error:
+        return jsonify({'error': error}), 400
 
     # Mirror the frame (optional, usually handled by CSS/JS on client)
     frame = cv2.flip(frame, 1)
-    
-    current_char = ""
-    # Safe AI processing
-    if hands and frame is not None:
-        try:
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = hands.process(rgb_frame)
-
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    # Draw landmarks if drawer exists
-                    if mp_draw and mp_hands:
-                        mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                    
-                    # Predict if model and extract_keypoints exist
-                    if model and extract_keypoints:
-                        try:
-                            keypoints = extract_keypoints(hand_landmarks)
-                            prediction = model.predict(np.expand_dims(keypoints, axis=0), verbose=0)
-                            predicted_index = np.argmax(prediction)
-                            
-                            if predicted_index in labels:
-                                char = labels[predicted_index]
-                                current_char = char
-                                
-                                # Stability check
-                                if predicted_index == last_predicted_label:
-                                    frame_count += 1
-                                else:
-                                    frame_count = 0
-                                    last_predicted_label = predicted_index
-                                
-                                # recognized
-                                if frame_count >= THRESHOLD_FRAMES:
-                                    output_text += char
-                                    frame_count = 0 
-                                    
-                        except Exception as e:
-                            pass
-        except Exception as e:
-            print(f"Processing error: {e}")
+    from flask import g
+    try:
+        predictions, hand_landmarks_list, model_version = detect_and_classify(frame, current_session(), g.session_id)
+    except TimeoutError as e:
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = str(config.RETRY_AFTER_SECONDS)
+        return response, 503
+    current_char = predictions[-1]['prediction'] if predictions else ""
+
+    body = {
+        'prediction': current_char,
+        'predictions': predictions,
+        'model_version': model_version
+    }
+
+    if mode == 'landmarks':
+        # Client draws its own overlay: skip drawing and encoding entirely
+        body['landmarks'] = [
+            [[lm.x, lm.y, lm.z] for lm in hand_landmarks.landmark]
+            for hand_landmarks in hand_landmarks_list
+        ]
+        return jsonify(body)
+
+    # Downscale before drawing so both drawing and encoding touch fewer pixels
+    if scale < 1.0:
+        frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    # Draw landmarks if drawer exists (coordinates are normalized, so any size works)
+    if mp_draw and mp_hands:
+        for hand_landmarks in hand_landmarks_list:
+            mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
 
     # Encode frame back to display landmarks if processed
-    _, buffer = cv2.imencode('.jpg', frame)
+    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
     jpg_as_text = base64.b64encode(buffer).decode('utf-8')
-    
+    body['image'] = f"data:image/jpeg;base64,{jpg_as_text}"
+    return jsonify(body)
+
+@app.route('/predict_landmarks', methods=['POST'])
+@requires_model
+def predict_landmarks():
+    """
+    Classifies hand landmarks detected client-side (MediaPipe Hands in the
+    browser), skipping image decode, detection and re-encode entirely.
+    """
+    from flask import request
+    from .utils import parse_landmark_hands
+
+    # Invalid JSON gives None, rejected with any other non-object body
+    data = request.get_json(silent=True)
+    try:
+        keypoints, handedness = parse_landmark_hands(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    session = current_session()
+    predictions, model_version = [], model_manager.current.version
+    if len(keypoints):
+        predictions, model_version = classify_hands(keypoints, handedness, session)
+
     return jsonify({
-        'prediction': current_char,
-        'image': f"data:image/jpeg;base64,{jpg_as_text}"
+        'predictions': predictions,
+        'text': session.output_text,
+        'model_version': model_version
     })
 
+# --- WebSocket Streaming ---
+try:
+    from flask_sock import Sock
+    sock = Sock(app)
+except ImportError:
+    sock = None
+    print("⚠️ flask-sock not installed, /ws streaming disabled.")
+
+def handle_stream_message(message, session, session_id=None):
+    """
+    Processes one message of a /ws connection and returns the events to push back.
+
+    Binary messages are encoded frames (JPEG/PNG), refused on workers without
+    MediaPipe. Text messages are JSON:
+      {"type": "landmarks", "hands": [...], "mirrored": true}  (same body as /predict_landmarks)
+      {"type": "clear"}
+      {"type": "new_sign"}
+    """
+    from .utils import parse_landmark_hands
+
+    if isinstance(message, (bytes, bytearray)):
+        if hands_pool is None:
+            return [{'type': 'error', 'error': 'Hand detection is not available on this worker, send landmarks'}]
+        frame = cv2.imdecode(np.frombuffer(message, np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            return [{'type': 'error', 'error': 'Image decoding failed'}]
+        try:
+            predictions, hand_landmarks_list, model_version = detect_and_classify(cv2.flip(frame, 1), session, session_id)
+        except TimeoutError as e:
+            return [{'type': 'error', 'error': str(e)}]
+        landmarks = [
+            [[lm.x, lm.y, lm.z] for lm in hand_landmarks.landmark]
+            for hand_landmarks in hand_landmarks_list
+        ]
+    else:
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return [{'type': 'error', 'error': 'Messages must be binary frames or JSON'}]
+        if not isinstance(data, dict):
+            return [{'type': 'error', 'error': 'JSON messages must be objects with a "type"'}]
+        kind = data.get('type')
+        if kind == 'clear':
+            with session.lock:
+                session.clear_text()
+            return [{'type': 'text', 'text': session.output_text}]
+        if kind == 'new_sign':
+            with session.lock:
+                session.new_target(available_signs)
+                match = session.check_game()
+            return [{'type': 'game', 'target': session.current_target_sign, 'score': session.game_score, 'match': match}]
+        if kind != 'landmarks':
+            return [{'type': 'error', 'error': f"Unknown message type '{kind}'"}]
+        try:
+            keypoints, handedness = parse_landmark_hands(data)
+        except ValueError as e:
+            return [{'type': 'error', 'error': str(e)}]
+        predictions, model_version, landmarks = [], model_manager.current.version, None
+        if len(keypoints):
+            predictions, model_version = classify_hands(keypoints, handedness, session)
+
+    events = [{'type': 'prediction', 'predictions': predictions, 'model_version': model_version}]
+    if landmarks is not None:
+        events[0]['landmarks'] = landmarks
+    committed = [p['prediction'] for p in predictions if p['committed']]
+    for char in committed:
+        events.append({'type': 'commit', 'char': char, 'text': session.output_text})
+    with session.lock:
+        match = bool(committed) and session.check_game()
+    if match:
+        events.append({'type': 'game', 'target': session.current_target_sign, 'score': session.game_score, 'match': True})
+    return events
+
+if sock is not None:
+    @sock.route('/ws')
+    def stream(ws):
+        """
+        Long-lived recognition stream bound to the caller's session, picked
+        like for HTTP requests (a new one is announced in the first event)
+        and shared with them.
+        Messages are handled strictly in order, so a client that waits for
+        each 'prediction' event before sending the next frame gets natural
+        backpressure.
+        """
+        # Landmark messages only need the model; binary frames are refused
+        # per message while MediaPipe is missing
+        if not model_ready():
+            ws.send(json.dumps({'type': 'error', 'error': 'Worker is not ready'}))
+            return
+        from flask import g
+        session = current_session()
+        # The loop below loads and saves per message; without this, after_request
+        # would write the connect-time copy back over them when the socket closes
+        g.pop('recognition_session')
+        ws.send(json.dumps({'type': 'session', 'session_id': g.session_id, **session.snapshot()}))
+        while True:
+            message = ws.receive()
+            if message is None:
+                break
+            # Reload per message so changes made meanwhile through HTTP, possibly
+            # on another worker (e.g. /clear_text), are not overwritten by our save
+            session = None
+            try:
+                session = state_backend.load(g.session_id)
+                events = handle_stream_message(message, session, g.session_id)
+            except Exception as e:
+                # One bad message must not end the stream or lose the session
+                print(f"⚠️ Stream message failed: {e}")
+                events = [{'type': 'error', 'error': str(e)}]
+            for event in events:
+                ws.send(json.dumps(event))
+            if session is not None:
+                save_if_changed(g.session_id, session)
+
+@app.route('/metrics')
+def metrics():
+    return jsonify({
+        'batching': batcher.metrics() if batcher else None,
+        'hands_pool': hands_pool.metrics() if hands_pool else None,
+        'sessions': state_backend.metrics()
+    })
+
+@app.route('/healthz')
+def healthz():
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz')
+def readyz():
+    body = {
+        'ready': is_ready(),
+        'components': startup['components'],
+        'errors': startup['errors'],
+        'warmup_ms': model_manager.warmup_timings,
+        'model_version': model_manager.current.version if model_manager.current else None
+    }
+    return jsonify(body), 200 if body['ready'] else 503
+
+@app.route('/admin/reload_model', methods=['POST'])
+def reload_model():
+    from flask import request
+    # Each reload hashes, loads and warms the model, so never expose it unauthenticated
+    if not config.ADMIN_TOKEN:
+        return jsonify({'error': 'Model reload is disabled, set SIGNDECODE_ADMIN_TOKEN to enable it'}), 403
+    token = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(token.encode('utf8'), config.ADMIN_TOKEN.encode('utf8')):
+        return jsonify({'error': 'Forbidden'}), 403
+    # Load and warm up in the background; the swap happens once it is ready
+    started = model_manager.reload_async(force=True)
+    return jsonify({'status': 'reloading' if started else 'already_reloading', 'model': model_manager.status()}), 202
+
+@app.route('/admin/model')
+def model_info():
+    return jsonify(model_manager.status())
+
 @app.route('/video_feed')
 def video_feed():
     return "Deprecated: Use /process_frame", 410
@@ -136,38 +655,68 @@ def video_feed():
 def index():
     return render_template('index.html')
 
+@app.route('/events')
+def events():
+    """
+    Server-Sent Events stream of transcript and game updates. Emits the
+    current state on connect, then one event per commit, clear or game change.
+    """
+    from flask import g
+    session = current_session()
+    # Events come from whichever worker handles the session's next commit
+    subscription = state_backend.subscribe(g.session_id)
+    snapshot = session.snapshot()
+
+    def stream():
+        try:
+            yield f"event: state\ndata: {json.dumps(snapshot)}\n\n"
+            while True:
+                try:
+                    event = subscription.get(timeout=config.SSE_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            subscription.close()
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/status')
 def status():
-    global output_text
-    return jsonify({'text': output_text})
+    return jsonify({'text': current_session().output_text})
 
 @app.route('/clear_text', methods=['POST'])
 def clear_text():
-    global output_text
-    output_text = ""
+    session = current_session()
+    with session.lock:
+        session.clear_text()
     return jsonify({'status': 'cleared'})
 
+@app.route('/add_space', methods=['POST'])
+def add_space():
+    session = current_session()
+    with session.lock:
+        session.end_word()
+    return jsonify({'text': session.output_text})
+
 @app.route('/get_new_sign', methods=['GET'])
 def get_new_sign():
-    global current_target_sign, available_signs
-    if not available_signs:
-        return jsonify({'sign': '?'})
-    current_target_sign = random.choice(available_signs)
-    return jsonify({'sign': current_target_sign})
+    session = current_session()
+    with session.lock:
+        sign = session.new_target(available_signs)
+    return jsonify({'sign': sign or '?'})
 
 @app.route('/game_status')
 def game_status():
-    global output_text, current_target_sign, game_score
-    match = False
-    if current_target_sign and current_target_sign.lower() in output_text.lower():
-        match = True
-        game_score += 1
-        output_text = "" # Clear text after successful match
-    
+    session = current_session()
+    with session.lock:
+        match = session.check_game()
     return jsonify({
         'match': match,
-        'score': game_score,
-        'current_text': output_text
+        'score': session.game_score,
+        'current_text': session.output_text
     })
 
 if __name__ == '__main__':
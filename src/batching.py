@@ -0,0 +1,133 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class Histogram:
+    """
+    Fixed-bucket cumulative histogram, cheap enough to update on every request.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self.counts)
+            count, total = self.count, self.sum
+        cumulative, buckets = 0, {}
+        for bound, n in zip(self.buckets + ["+Inf"], counts):
+            cumulative += n
+            buckets[str(bound)] = cumulative
+        return {"buckets": buckets, "count": count, "sum": total}
+
+
+class _Request:
+    __slots__ = ("keypoints", "future", "enqueued")
+
+    def __init__(self, keypoints):
+        self.keypoints = keypoints
+        self.future = Future()
+        self.enqueued = time.monotonic()
+
+
+class MicroBatcher:
+    """
+    Collects keypoint vectors from concurrent requests and classifies them in
+    a single batched forward pass.
+
+    A batch is closed when it holds `max_batch_size` rows or when `max_wait_ms`
+    has passed since its first request arrived, whichever comes first.
+    """
+
+    def __init__(self, predict_batch, max_batch_size=16, max_wait_ms=3.0):
+        """
+        :param predict_batch: Callable mapping an (n, 63) array to (probabilities (n, num_classes), version),
+                              e.g. ModelManager.predict_batch
+        :param max_batch_size: Maximum number of rows per forward pass
+        :param max_wait_ms: Maximum time a request waits for others to join its batch
+        """
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batch_size_histogram = Histogram([1, 2, 4, 8, 16, 32, 64])
+        self.queue_wait_histogram = Histogram([0.5, 1, 2, 5, 10, 25, 50, 100])
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, keypoints):
+        """
+        :param keypoints: Array of shape (n, 63); all rows stay in the same batch
+        :return: Future resolving to (probabilities of shape (n, num_classes), version
+                 of the model that served the batch)
+        """
+        request = _Request(np.asarray(keypoints, dtype=np.float32))
+        self._queue.put(request)
+        return request.future
+
+    def predict(self, keypoints, timeout=None):
+        return self.submit(keypoints).result(timeout)
+
+    def metrics(self):
+        return {
+            "batch_size": self.batch_size_histogram.snapshot(),
+            "queue_wait_ms": self.queue_wait_histogram.snapshot(),
+            "pending": self._queue.qsize(),
+        }
+
+    def _collect(self):
+        first = self._queue.get()
+        batch, rows = [first], len(first.keypoints)
+        deadline = time.monotonic() + self.max_wait
+        while rows < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            rows += len(request.keypoints)
+        return batch, rows
+
+    def _run(self):
+        while True:
+            batch, rows = self._collect()
+            started = time.monotonic()
+            for request in batch:
+                self.queue_wait_histogram.observe((started - request.enqueued) * 1000.0)
+            self.batch_size_histogram.observe(rows)
+
+            try:
+                inputs = np.concatenate([request.keypoints for request in batch], axis=0)
+                probabilities, version = self.predict_batch(inputs)
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            offset = 0
+            for request in batch:
+                n = len(request.keypoints)
+                request.future.set_result((probabilities[offset:offset + n], version))
+                offset += n
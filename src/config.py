@@ -0,0 +1,82 @@
+import os
+
+# Runtime settings, overridable through environment variables so the same
+# code runs under `python run.py`, gunicorn and the desktop UI.
+
+MODEL_PATH = os.environ.get("SIGNDECODE_MODEL_PATH", "models/sign_language_model.h5")
+
+# Inference backend: "keras" (full TensorFlow) or "numpy" (Dense weights only)
+MODEL_BACKEND = os.environ.get("SIGNDECODE_MODEL_BACKEND", "numpy")
+
+# When set, compare the chosen backend against Keras once at load time
+VERIFY_BACKEND = os.environ.get("SIGNDECODE_VERIFY_BACKEND", "0") == "1"
+
+# Cross-request micro-batching of classifier calls
+BATCHING_ENABLED = os.environ.get("SIGNDECODE_BATCHING", "0") == "1"
+BATCH_MAX_SIZE = int(os.environ.get("SIGNDECODE_BATCH_MAX_SIZE", "16"))
+BATCH_WINDOW_MS = float(os.environ.get("SIGNDECODE_BATCH_WINDOW_MS", "3"))
+
+# Hot reload: poll the model artifact every N seconds (0 disables polling;
+# POST /admin/reload_model still works when ADMIN_TOKEN is set)
+MODEL_RELOAD_INTERVAL = float(os.environ.get("SIGNDECODE_MODEL_RELOAD_INTERVAL", "10"))
+
+# Shared secret for POST /admin/reload_model, sent as the X-Admin-Token header
+# (unset disables the endpoint)
+ADMIN_TOKEN = os.environ.get("SIGNDECODE_ADMIN_TOKEN")
+
+# Requests arriving before the worker is ready wait up to this long, then get a 503
+READY_WAIT_SECONDS = float(os.environ.get("SIGNDECODE_READY_WAIT_SECONDS", "0"))
+RETRY_AFTER_SECONDS = int(os.environ.get("SIGNDECODE_RETRY_AFTER_SECONDS", "2"))
+
+# Batch sizes exercised by the warm-up passes run at model load: one or two
+# hands per frame, plus full micro-batches when batching is enabled
+WARMUP_BATCH_SIZES = [int(n) for n in os.environ.get("SIGNDECODE_WARMUP_BATCH_SIZES", "1,2").split(",") if n]
+if BATCHING_ENABLED and BATCH_MAX_SIZE not in WARMUP_BATCH_SIZES:
+    WARMUP_BATCH_SIZES.append(BATCH_MAX_SIZE)
+
+# Defaults for images returned by /process_frame (overridable per request)
+JPEG_QUALITY = int(os.environ.get("SIGNDECODE_JPEG_QUALITY", "95"))
+PREVIEW_SCALE = float(os.environ.get("SIGNDECODE_PREVIEW_SCALE", "0.5"))
+
+# Idle Server-Sent Events streams send a comment line this often to keep proxies from closing them
+SSE_KEEPALIVE_SECONDS = float(os.environ.get("SIGNDECODE_SSE_KEEPALIVE_SECONDS", "15"))
+
+# Per-session recognition state
+SESSION_TTL_SECONDS = float(os.environ.get("SIGNDECODE_SESSION_TTL_SECONDS", "1800"))
+MAX_SESSIONS = int(os.environ.get("SIGNDECODE_MAX_SESSIONS", "10000"))
+SESSION_MEMORY_MB = float(os.environ.get("SIGNDECODE_SESSION_MEMORY_MB", "64"))
+MAX_TEXT_LENGTH = int(os.environ.get("SIGNDECODE_MAX_TEXT_LENGTH", "10000"))
+
+# Where session state lives: "memory" (per process) or "redis" (shared by all
+# workers and nodes; any Redis-protocol server at REDIS_URL)
+STATE_BACKEND = os.environ.get("SIGNDECODE_STATE_BACKEND", "memory")
+REDIS_URL = os.environ.get("SIGNDECODE_REDIS_URL", "redis://localhost:6379/0")
+
+# MediaPipe Hands instances per worker process (each runs one frame at a time)
+HANDS_POOL_SIZE = int(os.environ.get("SIGNDECODE_HANDS_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+HANDS_POOL_PREWARM = int(os.environ.get("SIGNDECODE_HANDS_POOL_PREWARM", "1"))
+HANDS_POOL_TIMEOUT_SECONDS = float(os.environ.get("SIGNDECODE_HANDS_POOL_TIMEOUT_SECONDS", "5"))
+
+# Temporal smoothing of per-hand predictions: probabilities are averaged
+# ("ema" or "window" mode) and a letter is committed once the averaged
+# confidence stays above COMMIT_THRESHOLD for COMMIT_DWELL_MS milliseconds
+SMOOTHING_MODE = os.environ.get("SIGNDECODE_SMOOTHING_MODE", "ema")
+SMOOTHING_WINDOW = int(os.environ.get("SIGNDECODE_SMOOTHING_WINDOW", "8"))
+SMOOTHING_ALPHA = float(os.environ.get("SIGNDECODE_SMOOTHING_ALPHA", "0.35"))
+COMMIT_THRESHOLD = float(os.environ.get("SIGNDECODE_COMMIT_THRESHOLD", "0.8"))
+COMMIT_DWELL_MS = float(os.environ.get("SIGNDECODE_COMMIT_DWELL_MS", "300"))
+
+# Optional streaming sequence model for motion signs, trained by
+# training/train_sequence_model.py. Its prediction replaces the per-frame
+# classifier's when one of SEQUENCE_LABELS reaches SEQUENCE_THRESHOLD.
+SEQUENCE_MODEL_PATH = os.environ.get("SIGNDECODE_SEQUENCE_MODEL_PATH", "models/sign_sequence_model.h5")
+SEQUENCE_LABELS = [c for c in os.environ.get("SIGNDECODE_SEQUENCE_LABELS", "J,Z").split(",") if c]
+SEQUENCE_THRESHOLD = float(os.environ.get("SIGNDECODE_SEQUENCE_THRESHOLD", "0.7"))
+
+# Optional lexicon decoder: a word list (one word per line, optionally with a
+# count) turns committed letters into corrected words. Empty disables it.
+LEXICON_PATH = os.environ.get("SIGNDECODE_LEXICON_PATH", "")
+NGRAM_ORDER = int(os.environ.get("SIGNDECODE_NGRAM_ORDER", "3"))
+BEAM_WIDTH = int(os.environ.get("SIGNDECODE_BEAM_WIDTH", "8"))
+LM_WEIGHT = float(os.environ.get("SIGNDECODE_LM_WEIGHT", "0.5"))
+WORD_GAP_MS = float(os.environ.get("SIGNDECODE_WORD_GAP_MS", "1500"))
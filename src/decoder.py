@@ -0,0 +1,222 @@
+import math
+import os
+import numpy as np
+
+
+class Lexicon:
+    """
+    Word list compiled into flat arrays: a prefix trie in CSR form (child
+    symbols of every node stored contiguously) and a character n-gram table
+    of log probabilities. Both are built once and shared by every session.
+
+    Symbols are label indices from src/labels.py, so a classifier probability
+    vector indexes them directly; `len(alphabet)` is the word boundary.
+    """
+
+    def __init__(self, offsets, child_symbols, child_nodes, terminal, ngram, order, alphabet):
+        self.offsets = offsets  # int32 (nodes + 1,), children of node n are offsets[n]:offsets[n + 1]
+        self.child_symbols = child_symbols  # bytes, one symbol per edge
+        self.child_nodes = child_nodes  # int32 (edges,)
+        self.terminal = terminal  # bool (nodes,)
+        self.ngram = ngram  # float32 (V ** (order - 1), V) log probabilities
+        self.order = order
+        self.alphabet = alphabet
+        self.boundary = len(alphabet)
+        self.contexts = (len(alphabet) + 1) ** (order - 1)
+        context = 0
+        for _ in range(order - 1):
+            context = context * (len(alphabet) + 1) + self.boundary
+        self.start_context = context
+
+    @classmethod
+    def build(cls, words, alphabet, order=3, smoothing=0.1):
+        """
+        :param words: Iterable of (word, count) pairs
+        :param alphabet: Label characters in label-index order
+        :param order: n of the character n-gram prior
+        :param smoothing: Add-k smoothing of the n-gram counts
+        """
+        index = {char.upper(): i for i, char in enumerate(alphabet)}
+        size = len(alphabet) + 1
+        boundary = len(alphabet)
+        contexts = size ** (order - 1)
+        counts = np.zeros((contexts, size), dtype=np.float64)
+        children = [{}]
+        terminal = [False]
+
+        for word, count in words:
+            symbols = [index.get(char) for char in word.upper()]
+            if not symbols or None in symbols:
+                continue  # characters the recogniser cannot produce
+            node = 0
+            for symbol in symbols:
+                child = children[node].get(symbol)
+                if child is None:
+                    child = children[node][symbol] = len(children)
+                    children.append({})
+                    terminal.append(False)
+                node = child
+            terminal[node] = True
+
+            context = 0
+            for _ in range(order - 1):
+                context = context * size + boundary
+            for symbol in symbols + [boundary]:
+                counts[context, symbol] += count
+                context = (context * size + symbol) % contexts
+
+        counts += smoothing
+        ngram = np.log(counts / counts.sum(axis=1, keepdims=True)).astype(np.float32)
+
+        offsets = np.zeros(len(children) + 1, dtype=np.int32)
+        child_symbols = bytearray()
+        child_nodes = []
+        for node, node_children in enumerate(children):
+            for symbol in sorted(node_children):
+                child_symbols.append(symbol)
+                child_nodes.append(node_children[symbol])
+            offsets[node + 1] = len(child_nodes)
+        return cls(offsets, bytes(child_symbols), np.array(child_nodes, dtype=np.int32),
+                   np.array(terminal, dtype=bool), ngram, order, list(alphabet))
+
+    @classmethod
+    def load(cls, path, alphabet, order=3):
+        """
+        Reads a word list (one word per line, optionally followed by a count)
+        and compiles it, reusing `<path>.<order>gram.npz` when it is newer than
+        the list and was built for the same alphabet.
+        """
+        cache = f"{path}.{order}gram.npz"
+        if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+            with np.load(cache) as data:
+                if list(data["alphabet"]) == list(alphabet):
+                    return cls(data["offsets"], data["child_symbols"].tobytes(), data["child_nodes"],
+                               data["terminal"], data["ngram"], order, list(alphabet))
+
+        def read_words():
+            with open(path, encoding="utf8") as f:
+                for line in f:
+                    parts = line.split()
+                    if parts:
+                        yield parts[0], float(parts[1]) if len(parts) > 1 else 1.0
+
+        lexicon = cls.build(read_words(), alphabet, order)
+        try:
+            np.savez(cache, offsets=lexicon.offsets,
+                     child_symbols=np.frombuffer(lexicon.child_symbols, dtype=np.uint8),
+                     child_nodes=lexicon.child_nodes, terminal=lexicon.terminal,
+                     ngram=lexicon.ngram, alphabet=np.array(alphabet))
+        except OSError as e:
+            print(f"⚠️ Could not cache compiled lexicon: {e}")
+        return lexicon
+
+    def child(self, node, symbol):
+        """
+        :return: Trie node reached from `node` by `symbol`, or -1
+        """
+        start, end = self.offsets[node], self.offsets[node + 1]
+        i = self.child_symbols.find(symbol, start, end)
+        return -1 if i < 0 else int(self.child_nodes[i])
+
+    def next_context(self, context, symbol):
+        return (context * (self.boundary + 1) + symbol) % self.contexts
+
+    def nbytes(self):
+        return (self.offsets.nbytes + len(self.child_symbols) + self.child_nodes.nbytes
+                + self.terminal.nbytes + self.ngram.nbytes)
+
+
+class WordBeam:
+    """
+    Decoding state of the word being signed in one session.
+    Each hypothesis is (score, trie node or -1 when out of lexicon, n-gram context, word).
+    """
+
+    __slots__ = ("hypotheses",)
+
+    def __init__(self, hypotheses):
+        self.hypotheses = hypotheses
+
+    def nbytes(self):
+        return 64 * len(self.hypotheses)
+
+    def to_state(self):
+        return [list(h) for h in self.hypotheses]
+
+    def load_state(self, state):
+        self.hypotheses = [tuple(h) for h in state]
+
+
+class BeamDecoder:
+    """
+    Rescores committed letters with a lexicon: every commit extends a small
+    beam of word hypotheses with the `top_k` most likely letters of its
+    probability vector, weighted by the character n-gram prior. Hypotheses
+    must stay inside the trie unless they pay `oov_penalty` once, so names
+    and other unknown words can still be spelled. A pause of `word_gap_ms`
+    between commits ends the word.
+    """
+
+    def __init__(self, lexicon, beam_width=8, top_k=4, lm_weight=0.5, oov_penalty=-6.0, word_gap_ms=1500):
+        self.lexicon = lexicon
+        self.word_gap_ms = word_gap_ms
+        self.beam_width = beam_width
+        self.top_k = top_k
+        self.lm_weight = lm_weight
+        self.oov_penalty = oov_penalty
+
+    def new_state(self):
+        return WordBeam([(0.0, 0, self.lexicon.start_context, "")])
+
+    def step(self, state, probabilities):
+        """
+        Extends the beam by one letter.
+
+        :param state: WordBeam of the session
+        :param probabilities: Probability vector of the committed letter
+        :return: Best spelling of the current word
+        """
+        lexicon = self.lexicon
+        probabilities = np.asarray(probabilities)
+        k = min(self.top_k, len(probabilities))
+        candidates = np.argpartition(probabilities, -k)[-k:]
+        log_probs = np.log(np.maximum(probabilities[candidates], 1e-9))
+
+        extended = {}
+        for score, node, context, word in state.hypotheses:
+            for symbol, log_p in zip(candidates.tolist(), log_probs.tolist()):
+                if symbol >= lexicon.boundary:
+                    continue
+                new_score = score + log_p + self.lm_weight * float(lexicon.ngram[context, symbol])
+                child = lexicon.child(node, symbol) if node >= 0 else -1
+                if child < 0 and node >= 0:
+                    new_score += self.oov_penalty
+                new_word = word + lexicon.alphabet[symbol]
+                if new_word not in extended or extended[new_word][0] < new_score:
+                    extended[new_word] = (new_score, child, lexicon.next_context(context, symbol), new_word)
+
+        state.hypotheses = sorted(extended.values(), reverse=True)[:self.beam_width]
+        return state.hypotheses[0][3]
+
+    def best(self, state):
+        return state.hypotheses[0][3] if state.hypotheses else ""
+
+    def finish(self, state):
+        """
+        Closes the current word: complete lexicon words score the word-end
+        prior, unfinished prefixes are treated as out of lexicon.
+
+        :return: Decoded word ('' when nothing was signed) and resets the state
+        """
+        lexicon = self.lexicon
+        best_word, best_score = "", -math.inf
+        for score, node, context, word in state.hypotheses:
+            if not word:
+                continue
+            score += self.lm_weight * float(lexicon.ngram[context, lexicon.boundary])
+            if node >= 0 and not lexicon.terminal[node]:
+                score += self.oov_penalty
+            if score > best_score:
+                best_word, best_score = word, score
+        state.hypotheses = self.new_state().hypotheses
+        return best_word
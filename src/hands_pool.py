@@ -0,0 +1,111 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from .batching import Histogram
+
+
+class HandsPool:
+    """
+    Bounded pool of MediaPipe Hands instances, one checked out per request.
+
+    A Hands graph is stateful and must not run process() concurrently, so
+    each in-flight frame gets its own instance and detection runs in
+    parallel across cores. Checkouts prefer the instance a session used
+    last, so tracking keeps following one user's frames; an instance handed
+    to a different session is reset first so tracks never mix users.
+    """
+
+    def __init__(self, factory, size=2, timeout=5.0):
+        """
+        :param factory: Callable creating a new Hands instance
+        :param size: Maximum number of instances
+        :param timeout: Seconds to wait for a free instance before TimeoutError
+        """
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.created = 0
+        self.checkouts = 0
+        self.affinity_hits = 0
+        self.timeouts = 0
+        self.wait_histogram = Histogram([0.1, 1, 5, 10, 25, 50, 100, 250, 1000])
+        self._idle = []  # least recently returned first
+        self._owners = {}  # id(instance) -> session key of its last user
+        self._cond = threading.Condition()
+
+    def prewarm(self, count=1):
+        """
+        Creates instances ahead of the first request.
+        """
+        with self._cond:
+            count = min(count, self.size - self.created)
+            self.created += count
+        instances = [self.factory() for _ in range(count)]
+        with self._cond:
+            self._idle.extend(instances)
+            self._cond.notify_all()
+
+    def _take_idle(self, key):
+        for i, instance in enumerate(self._idle):
+            if key is not None and self._owners.get(id(instance)) == key:
+                self.affinity_hits += 1
+                return self._idle.pop(i)
+        return self._idle.pop(0)
+
+    @contextmanager
+    def checkout(self, key=None):
+        """
+        :param key: Session key used for tracking affinity
+        :return: Context manager yielding a Hands instance
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        instance = None
+        create = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    instance = self._take_idle(key)
+                    break
+                if self.created < self.size:
+                    self.created += 1
+                    create = True
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise TimeoutError("No MediaPipe Hands instance available")
+                self._cond.wait(remaining)
+            self.checkouts += 1
+
+        if create:
+            try:
+                instance = self.factory()
+            except Exception:
+                with self._cond:
+                    self.created -= 1
+                    self._cond.notify()
+                raise
+        elif self._owners.get(id(instance)) != key and hasattr(instance, "reset"):
+            instance.reset()
+        self.wait_histogram.observe((time.monotonic() - start) * 1000.0)
+
+        try:
+            yield instance
+        finally:
+            with self._cond:
+                self._owners[id(instance)] = key
+                self._idle.append(instance)
+                self._cond.notify()
+
+    def metrics(self):
+        return {
+            "size": self.size,
+            "created": self.created,
+            "idle": len(self._idle),
+            "checkouts": self.checkouts,
+            "affinity_hits": self.affinity_hits,
+            "timeouts": self.timeouts,
+            "wait_ms": self.wait_histogram.snapshot(),
+        }
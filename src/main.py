@@ -3,12 +3,13 @@ import mediapipe as mp
 import numpy as np
 import pyttsx3
 from collections import deque
-from tensorflow.keras.models import load_model
+from model import SignLanguageModel
 from ui import SignLanguageApp
 from labels import labels
+import config
 
 # Load trained sign language model
-model = load_model("sign_language_model.h5")
+model = SignLanguageModel("sign_language_model.h5", backend=config.MODEL_BACKEND)
 
 mp_hands = mp.solutions.hands
 hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7)
@@ -1,12 +1,267 @@
+import json
+import os
+import threading
+import time
 import numpy as np
-from tensorflow.keras.models import load_model
+
+
+def _relu(x):
+    return np.maximum(x, 0.0, out=x)
+
+
+def _softmax(x):
+    x = x - x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+
+def _linear(x):
+    return x
+
+
+ACTIVATIONS = {"relu": _relu, "softmax": _softmax, "linear": _linear}
+
+
+def _as_strings(values):
+    return [v.decode("utf8") if isinstance(v, bytes) else str(v) for v in values]
+
+
+def _dense_activations(model_config, classes=("Dense",)):
+    """
+    Maps Dense layer names to their activation using the config stored in the .h5 file.
+
+    :param model_config: JSON model config attribute (str or bytes), may be None
+    :param classes: Layer class names to include
+    :return: dict of layer name -> activation name
+    """
+    if model_config is None:
+        return {}
+    if isinstance(model_config, bytes):
+        model_config = model_config.decode("utf8")
+    config = json.loads(model_config).get("config", {})
+    layers = config.get("layers", []) if isinstance(config, dict) else config
+    return {
+        layer["config"]["name"]: layer["config"].get("activation", "linear")
+        for layer in layers
+        if layer.get("class_name") in classes
+    }
+
+
+def load_dense_layers(model_path, classes=("Dense",)):
+    """
+    Reads the kernel, bias and activation of every Dense layer from a Keras .h5 file.
+    Layers without weights (Dropout, InputLayer, pooling) are skipped since they
+    are no-ops at inference time.
+
+    :param model_path: Path to the .h5 model
+    :param classes: Weighted layer classes whose activation is read from the config
+    :return: List of (kernel, bias, activation) tuples in forward order
+    """
+    import h5py
+
+    with h5py.File(model_path, "r") as f:
+        activations = _dense_activations(f.attrs.get("model_config"), classes)
+        weights = f["model_weights"] if "model_weights" in f else f
+        layers = []
+        for name in _as_strings(weights.attrs["layer_names"]):
+            group = weights[name]
+            weight_names = _as_strings(group.attrs.get("weight_names", []))
+            if not weight_names:
+                continue
+            arrays = {
+                wn.split("/")[-1].split(":")[0]: np.asarray(group[wn], dtype=np.float32)
+                for wn in weight_names
+            }
+            layers.append((arrays["kernel"], arrays["bias"], activations.get(name)))
+
+    # Fall back to the training architecture if the config was not saved
+    for i, (kernel, bias, activation) in enumerate(layers):
+        if activation is None:
+            activation = "softmax" if i == len(layers) - 1 else "relu"
+            layers[i] = (kernel, bias, activation)
+    return layers
+
+
+class KerasBackend:
+    """
+    Calls the Keras model through a single traced tf.function with a dynamic
+    batch dimension, avoiding the per-call setup of `model.predict`.
+    """
+
+    def __init__(self, model_path):
+        import tensorflow as tf
+        from tensorflow.keras.models import load_model
+        self.model = load_model(model_path, compile=False)
+        signature = [tf.TensorSpec([None, self.model.input_shape[-1]], tf.float32)]
+        self._call = tf.function(lambda x: self.model(x, training=False), input_signature=signature)
+
+    def predict_batch(self, keypoints):
+        return self._call(keypoints).numpy()
+
+
+class NumpyBackend:
+    """
+    Runs the Dense stack of the trained MLP as plain NumPy matmuls, so serving
+    does not need TensorFlow once the weights are read from the .h5 file.
+    """
+
+    def __init__(self, model_path):
+        self.layers = load_dense_layers(model_path)
+
+    def predict_batch(self, keypoints):
+        x = np.asarray(keypoints, dtype=np.float32)
+        for kernel, bias, activation in self.layers:
+            x = x @ kernel
+            x += bias
+            x = ACTIVATIONS[activation](x)
+        return x
+
+
+class TFLiteBackend:
+    """
+    Runs an exported TensorFlow Lite flatbuffer, using the standalone
+    tflite_runtime package when it is installed.
+    """
+
+    def __init__(self, model_path):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+        self.interpreter = Interpreter(model_path=model_path)
+        self.interpreter.allocate_tensors()
+        self._lock = threading.Lock()  # an Interpreter must not be invoked concurrently
+        self._refresh_details()
+
+    def _refresh_details(self):
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+
+    def _quantize(self, keypoints):
+        # Fully integer models (see training/quantize_model.py) take int8 inputs
+        scale, zero_point = self.input["quantization"]
+        if self.input["dtype"] == np.float32 or scale == 0:
+            return keypoints
+        info = np.iinfo(self.input["dtype"])
+        q = np.round(keypoints / scale) + zero_point
+        return np.clip(q, info.min, info.max).astype(self.input["dtype"])
+
+    def _dequantize(self, output):
+        scale, zero_point = self.output["quantization"]
+        if self.output["dtype"] == np.float32 or scale == 0:
+            return output.copy()
+        return (output.astype(np.float32) - zero_point) * scale
+
+    def predict_batch(self, keypoints):
+        with self._lock:
+            if tuple(self.input["shape"]) != keypoints.shape:
+                self.interpreter.resize_tensor_input(self.input["index"], keypoints.shape)
+                self.interpreter.allocate_tensors()
+                self._refresh_details()
+            self.interpreter.set_tensor(self.input["index"], self._quantize(keypoints))
+            self.interpreter.invoke()
+            return self._dequantize(self.interpreter.get_tensor(self.output["index"]))
+
+
+class OnnxBackend:
+    def __init__(self, model_path):
+        import onnxruntime
+        self.session = onnxruntime.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict_batch(self, keypoints):
+        return self.session.run(None, {self.input_name: keypoints})[0]
+
+
+BACKENDS = {
+    "keras": KerasBackend,
+    "numpy": NumpyBackend,
+    "tflite": TFLiteBackend,
+    "tflite_int8": TFLiteBackend,
+    "onnx": OnnxBackend,
+}
+
+# Artifact each backend loads, relative to the trained .h5 file
+EXTENSIONS = {
+    "keras": ".h5",
+    "numpy": ".h5",
+    "tflite": ".tflite",
+    "tflite_int8": "_int8.tflite",
+    "onnx": ".onnx",
+}
+
+
+def resolve_model_path(model_path, backend):
+    """
+    Maps a model path to the artifact for the given backend, so a single
+    configured path (e.g. models/sign_language_model.h5) also finds the
+    exported .tflite / .onnx files next to it.
+    """
+    if model_path.endswith(EXTENSIONS[backend]):
+        return model_path
+    return os.path.splitext(model_path)[0] + EXTENSIONS[backend]
+
 
 class SignLanguageModel:
-    def __init__(self, model_path="models/sign_language_model.h5"):
-        self.model = load_model(model_path)
+    def __init__(self, model_path="models/sign_language_model.h5", backend="keras"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown model backend '{backend}', expected one of {sorted(BACKENDS)}")
+        self.backend = backend
+        self.model_path = resolve_model_path(model_path, backend)
+        self.model = BACKENDS[backend](self.model_path)
+
+    def predict_batch(self, keypoints):
+        """
+        :param keypoints: Array of shape (n, 63)
+        :return: Class probabilities of shape (n, num_classes)
+        """
+        return self.model.predict_batch(np.asarray(keypoints, dtype=np.float32))
+
+    def warm_up(self, batch_sizes=(1,), repeats=3):
+        """
+        Runs dummy forward passes so graph tracing, buffer allocation and
+        interpreter resizing happen before the first real request.
+
+        :param batch_sizes: Batch sizes served in production
+        :param repeats: Passes per batch size; the first one is reported separately
+        :return: dict of batch size -> {"first_ms", "steady_ms"}
+        """
+        timings = {}
+        for batch_size in batch_sizes:
+            x = np.zeros((batch_size, 63), dtype=np.float32)
+            elapsed = []
+            for _ in range(max(repeats, 2)):
+                start = time.perf_counter()
+                self.predict_batch(x)
+                elapsed.append((time.perf_counter() - start) * 1000.0)
+            timings[batch_size] = {
+                "first_ms": round(elapsed[0], 3),
+                "steady_ms": round(float(np.median(elapsed[1:])), 3),
+            }
+        return timings
 
     def predict_sign(self, keypoints):
         keypoints = np.expand_dims(keypoints, axis=0)  # Reshape for model input
-        prediction = self.model.predict(keypoints,verbose = 0)
+        prediction = self.predict_batch(keypoints)
         predicted_label = np.argmax(prediction)
         return predicted_label
+
+
+def compare_backends(model_path, backend="numpy", samples=256, seed=0):
+    """
+    Checks a backend against the reference Keras model on random landmark vectors.
+
+    :param model_path: Path to the .h5 model
+    :param backend: Backend to check
+    :param samples: Number of random 63-float inputs
+    :return: (max absolute probability difference, argmax agreement ratio)
+    """
+    rng = np.random.default_rng(seed)
+    x = rng.random((samples, 63), dtype=np.float32)
+    reference = KerasBackend(resolve_model_path(model_path, "keras")).predict_batch(x)
+    candidate = BACKENDS[backend](resolve_model_path(model_path, backend)).predict_batch(x)
+    max_diff = float(np.max(np.abs(reference - candidate)))
+    agreement = float(np.mean(reference.argmax(axis=1) == candidate.argmax(axis=1)))
+    return max_diff, agreement
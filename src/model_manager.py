@@ -0,0 +1,168 @@
+import hashlib
+import os
+import threading
+import time
+from collections import namedtuple
+
+from .model import SignLanguageModel, resolve_model_path
+
+# Model and version are published together so a request that grabbed
+# `manager.current` keeps using one consistent pair even if a swap happens.
+LoadedModel = namedtuple("LoadedModel", ["model", "version", "loaded_at"])
+
+
+def file_version(path, chunk_size=1 << 20):
+    """
+    :param path: Model artifact
+    :return: Short content hash used as the model version
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+class ModelManager:
+    """
+    Owns the live model and swaps in a new one when its artifact changes on
+    disk, without restarting the worker.
+
+    New models are loaded and warmed up off the request path; the swap itself
+    is a single attribute assignment, so in-flight requests finish on the
+    model they started with.
+    """
+
+    def __init__(self, model_path, backend, warmup_batch_sizes=(1,)):
+        self.model_path = model_path
+        self.backend = backend
+        self.warmup_batch_sizes = tuple(warmup_batch_sizes)
+        self.warmup_timings = {}
+        self.current = None
+        self.last_error = None
+        self.load_timings = {}
+        self._fingerprint = None
+        self._missing = False  # artifact absent at the last check, already reported
+        self._reload_lock = threading.Lock()
+        self._async_lock = threading.Lock()
+        self._async_pending = False
+
+    def _artifact(self):
+        return resolve_model_path(self.model_path, self.backend)
+
+    def _stat(self):
+        st = os.stat(self._artifact())
+        return st.st_mtime_ns, st.st_size
+
+    def reload(self, force=False):
+        """
+        Loads the artifact if it changed since the last load (or when forced).
+
+        :return: True if a new model was swapped in
+        """
+        with self._reload_lock:
+            try:
+                fingerprint = self._stat()
+            except FileNotFoundError:
+                # No artifact (yet) counts as no change, so polling does not
+                # report it every interval; it loads once the file appears
+                reported, self._missing = self._missing, True
+                if force:
+                    raise
+                if not reported:
+                    print(f"⚠️ Model file {self._artifact()} not found, keeping the current model until it appears.")
+                return False
+            self._missing = False
+            if not force and fingerprint == self._fingerprint:
+                return False
+
+            version = file_version(self._artifact())
+            if not force and self.current is not None and version == self.current.version:
+                self._fingerprint = fingerprint
+                return False
+
+            try:
+                start = time.perf_counter()
+                model = SignLanguageModel(self.model_path, backend=self.backend)
+                loaded = time.perf_counter()
+                warmup_timings = model.warm_up(self.warmup_batch_sizes)
+                warmed = time.perf_counter()
+            except Exception as e:
+                # Keep serving the previous model; retry when the file changes again
+                self.last_error = str(e)
+                self._fingerprint = fingerprint
+                raise
+
+            self.load_timings = {
+                "model_load": round((loaded - start) * 1000.0, 1),
+                "warm_up": round((warmed - loaded) * 1000.0, 1),
+            }
+            self.warmup_timings = warmup_timings
+            self.current = LoadedModel(model, version, time.time())
+            self._fingerprint = fingerprint
+            self.last_error = None
+            return True
+
+    def reload_async(self, force=True):
+        """
+        Reloads in a background thread. Requests arriving while one is already
+        running or queued are coalesced into it.
+
+        :return: False if an earlier request already covers this one
+        """
+        with self._async_lock:
+            if self._async_pending:
+                return False
+            self._async_pending = True
+        threading.Thread(target=self._reload_background, args=(force,), daemon=True).start()
+        return True
+
+    def _reload_background(self, force):
+        try:
+            self._reload_logged(force)
+        finally:
+            with self._async_lock:
+                self._async_pending = False
+
+    def _reload_logged(self, force=False):
+        try:
+            if self.reload(force=force):
+                print(f"✅ Model {self.current.version} swapped in (warm-up: {self.format_warmup()}).")
+        except Exception as e:
+            print(f"⚠️ Model reload failed, keeping previous model: {e}")
+
+    def watch(self, interval):
+        """
+        Polls the artifact's mtime/size every `interval` seconds from a daemon thread.
+        """
+        def loop():
+            while True:
+                time.sleep(interval)
+                self._reload_logged()
+
+        threading.Thread(target=loop, daemon=True).start()
+
+    def format_warmup(self):
+        return ", ".join(
+            f"batch {size}: first {t['first_ms']} ms, steady {t['steady_ms']} ms"
+            for size, t in self.warmup_timings.items()
+        )
+
+    def predict_batch(self, keypoints):
+        """
+        :return: (probabilities, version) from one read of `current`, so the
+                 version always names the model that produced the probabilities
+        """
+        loaded = self.current
+        return loaded.model.predict_batch(keypoints), loaded.version
+
+    def status(self):
+        current = self.current
+        return {
+            "version": current.version if current else None,
+            "backend": self.backend,
+            "path": self._artifact(),
+            "loaded_at": current.loaded_at if current else None,
+            "last_error": self.last_error,
+            "warmup_ms": self.warmup_timings,
+        }
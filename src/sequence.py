@@ -0,0 +1,163 @@
+import base64
+import json
+import numpy as np
+
+from .model import ACTIVATIONS, load_dense_layers
+
+
+def _input_window(model_path):
+    """
+    :return: Number of frames the sequence model was trained on, read from the
+             input shape in the .h5 model config
+    """
+    import h5py
+
+    with h5py.File(model_path, "r") as f:
+        model_config = f.attrs.get("model_config")
+    if isinstance(model_config, bytes):
+        model_config = model_config.decode("utf8")
+    config = json.loads(model_config).get("config", {})
+    layers = config.get("layers", []) if isinstance(config, dict) else config
+    for layer in layers:
+        layer_config = layer.get("config", {})
+        shape = layer_config.get("batch_input_shape") or layer_config.get("batch_shape")
+        if shape:
+            return int(shape[1])
+    raise ValueError(f"No input shape found in {model_path}")
+
+
+def _encode(array):
+    """
+    :return: float32 array as base64 text, about a fifth of its JSON list size
+    """
+    return base64.b64encode(array.tobytes()).decode("ascii")
+
+
+def _decode(data, shape):
+    # Lists are the format written before streams were stored as base64
+    if isinstance(data, str):
+        array = np.frombuffer(base64.b64decode(data), dtype=np.float32)
+    else:
+        array = np.asarray(data, dtype=np.float32)
+    if array.size != np.prod(shape):
+        raise ValueError(f"stream state has {array.size} values, expected {np.prod(shape)}")
+    return array.reshape(shape)
+
+
+class SequenceStream:
+    """
+    Per-hand streaming state of the sequence model: ring buffers of the last
+    `kernel_size` keypoint vectors and of the last convolution outputs, plus
+    the running sum the pooling layer needs. Everything is preallocated and
+    updated in place, so each frame costs one convolution step no matter how
+    long the window is.
+    """
+
+    __slots__ = ("frames", "outputs", "total", "scratch", "frame_index", "output_index", "count")
+
+    def __init__(self, kernel_size, features, filters, positions):
+        self.frames = np.zeros((kernel_size, features), dtype=np.float32)
+        self.outputs = np.zeros((positions, filters), dtype=np.float32)
+        self.total = np.zeros(filters, dtype=np.float64)
+        self.scratch = np.zeros(filters, dtype=np.float32)
+        self.frame_index = 0
+        self.output_index = 0
+        self.count = 0  # frames pushed, saturates at kernel_size + positions - 1
+
+    def reset(self):
+        self.frames.fill(0.0)
+        self.outputs.fill(0.0)
+        self.total.fill(0.0)
+        self.frame_index = 0
+        self.output_index = 0
+        self.count = 0
+
+    def nbytes(self):
+        return self.frames.nbytes + self.outputs.nbytes + self.total.nbytes + self.scratch.nbytes
+
+    def to_state(self):
+        return {
+            "frames": _encode(self.frames),
+            "outputs": _encode(self.outputs),
+            "frame_index": self.frame_index,
+            "output_index": self.output_index,
+            "count": self.count,
+        }
+
+    def load_state(self, state):
+        """
+        Raises ValueError, leaving the stream untouched, when the state was
+        written for a sequence model of another shape.
+        """
+        frames = _decode(state["frames"], self.frames.shape)
+        outputs = _decode(state["outputs"], self.outputs.shape)
+        self.frames[:] = frames
+        self.outputs[:] = outputs
+        self.total[:] = self.outputs.sum(axis=0)
+        self.frame_index = state["frame_index"]
+        self.output_index = state["output_index"]
+        self.count = state["count"]
+
+
+class SequenceModel:
+    """
+    Streaming NumPy runner for the temporal model trained by
+    training/train_sequence_model.py: a Conv1D over a window of
+    keypoint frames, global average pooling and a Dense head.
+
+    Convolution outputs only depend on `kernel_size` consecutive frames, so
+    each new frame adds exactly one output to the pooled sum and evicts the
+    oldest one; the window is never recomputed.
+    """
+
+    def __init__(self, model_path):
+        layers = load_dense_layers(model_path, classes=("Conv1D", "Dense"))
+        kernel, bias, activation = layers[0]
+        if kernel.ndim != 3:
+            raise ValueError(f"{model_path} does not start with a Conv1D layer")
+        self.kernel = kernel  # (kernel_size, features, filters)
+        self.bias = bias
+        self.activation = activation
+        self.head = layers[1:]
+        self.kernel_size, self.features, self.filters = kernel.shape
+        self.window = _input_window(model_path)
+        self.positions = self.window - self.kernel_size + 1
+        self.num_classes = self.head[-1][0].shape[1]
+
+    def new_stream(self):
+        return SequenceStream(self.kernel_size, self.features, self.filters, self.positions)
+
+    def step(self, stream, keypoints):
+        """
+        Pushes one frame into the stream and updates the pooled features.
+
+        :param stream: SequenceStream of the hand
+        :param keypoints: Keypoint vector of shape (63,)
+        :return: Class probabilities once a full window was seen, else None
+        """
+        stream.frames[stream.frame_index] = keypoints
+        stream.frame_index = (stream.frame_index + 1) % self.kernel_size
+        stream.count = min(stream.count + 1, self.window)
+        if stream.count < self.kernel_size:
+            return None
+
+        # Convolution over the last kernel_size frames, oldest first
+        out = stream.outputs[stream.output_index]
+        stream.total -= out
+        out[:] = self.bias
+        for offset in range(self.kernel_size):
+            frame = stream.frames[(stream.frame_index + offset) % self.kernel_size]
+            np.dot(frame, self.kernel[offset], out=stream.scratch)
+            out += stream.scratch
+        ACTIVATIONS[self.activation](out[np.newaxis])
+        stream.total += out
+        stream.output_index = (stream.output_index + 1) % self.positions
+        if stream.count < self.window:
+            return None
+
+        x = (stream.total / self.positions).astype(np.float32)[np.newaxis]
+        for kernel, bias, activation in self.head:
+            x = x @ kernel
+            x += bias
+            x = ACTIVATIONS[activation](x)
+        return x[0]
@@ -0,0 +1,343 @@
+import queue
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+# Guards subscribe/unsubscribe, which are rare compared to publish
+_subscribers_lock = threading.Lock()
+
+
+class RecognitionSession:
+    """
+    Recognition state of one client: a temporal smoother and a sequence
+    model stream per hand, the committed transcript (optionally rescored
+    word by word by a lexicon decoder) and the sign game.
+
+    State changes (commit, clear, score) are pushed to subscribers, e.g. the
+    /events Server-Sent Events stream, instead of being polled.
+
+    Concurrent requests of one client share the session object in the
+    in-process backend; callers hold `lock` while changing or saving it.
+    `dirty` marks unsaved changes, so read-only requests skip the write-back.
+    """
+
+    __slots__ = (
+        "smoother_factory", "stream_factory", "max_text_length", "trackers", "streams", "output_text",
+        "decoder", "words", "word_start", "last_commit",
+        "current_target_sign", "game_score", "match_pending", "subscribers",
+        "outbox", "last_seen", "size", "lock", "dirty",
+    )
+
+    def __init__(self, smoother_factory, max_text_length=None, stream_factory=None, decoder=None):
+        """
+        :param smoother_factory: Callable creating the TemporalSmoother of a new hand
+        :param stream_factory: Callable creating the SequenceStream of a new hand,
+                               returns None while no sequence model is loaded
+        :param decoder: Optional BeamDecoder correcting committed letters word by word
+        """
+        self.smoother_factory = smoother_factory
+        self.stream_factory = stream_factory
+        self.max_text_length = max_text_length
+        self.trackers = {}  # handedness -> TemporalSmoother
+        self.streams = {}  # handedness -> SequenceStream
+        self.output_text = ""
+        self.decoder = decoder
+        self.words = decoder.new_state() if decoder is not None else None  # beam of the current word
+        self.word_start = 0  # where the current word begins in output_text
+        self.last_commit = None
+        self.current_target_sign = None
+        self.game_score = 0
+        self.match_pending = False
+        self.subscribers = None  # created on first subscribe, most sessions never have one
+        self.outbox = None  # events collected for an external state backend to publish
+        self.last_seen = time.monotonic()
+        self.size = 0
+        self.lock = threading.RLock()
+        self.dirty = False
+
+    def tracker(self, hand):
+        tracker = self.trackers.get(hand)
+        if tracker is None:
+            tracker = self.trackers[hand] = self.smoother_factory()
+        return tracker
+
+    def stream(self, hand):
+        stream = self.streams.get(hand)
+        if stream is None and self.stream_factory is not None:
+            stream = self.stream_factory()
+            if stream is not None:
+                self.streams[hand] = stream
+        return stream
+
+    # --- Events ---
+
+    def subscribe(self, max_pending=100):
+        subscriber = queue.Queue(maxsize=max_pending)
+        with _subscribers_lock:
+            self.subscribers = (self.subscribers or []) + [subscriber]
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with _subscribers_lock:
+            remaining = [s for s in self.subscribers or [] if s is not subscriber]
+            self.subscribers = remaining or None
+
+    def publish(self, event_type, **data):
+        if not self.subscribers and self.outbox is None:
+            return
+        # Every event carries the full text and score, so a subscriber that
+        # had to drop events resynchronises on the next one
+        event = dict(data, type=event_type, text=self.output_text, score=self.game_score)
+        if self.outbox is not None:
+            self.outbox.append(event)
+        # The list is replaced, never mutated, so iterating a snapshot needs no lock
+        for subscriber in self.subscribers or ():
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                pass
+
+    def to_state(self):
+        """
+        :return: JSON-serialisable state, used by external state backends
+        """
+        return {
+            "text": self.output_text,
+            "target": self.current_target_sign,
+            "score": self.game_score,
+            "match_pending": self.match_pending,
+            "trackers": {hand: tracker.to_state() for hand, tracker in self.trackers.items()},
+            "streams": {hand: stream.to_state() for hand, stream in self.streams.items()},
+            "words": self.words.to_state() if self.words is not None else None,
+            "word_start": self.word_start,
+            "last_commit": self.last_commit,
+        }
+
+    def load_state(self, state):
+        self.output_text = state.get("text", "")
+        self.current_target_sign = state.get("target")
+        self.game_score = state.get("score", 0)
+        self.match_pending = state.get("match_pending", False)
+        self.word_start = min(state.get("word_start", 0), len(self.output_text))
+        self.last_commit = state.get("last_commit")
+        if self.words is not None and state.get("words"):
+            self.words.load_state(state["words"])
+        for hand, tracker_state in state.get("trackers", {}).items():
+            self.tracker(hand).load_state(tracker_state)
+        for hand, stream_state in state.get("streams", {}).items():
+            stream = self.stream(hand)
+            if stream is None:
+                continue  # the sequence model is gone
+            try:
+                stream.load_state(stream_state)
+            except ValueError:
+                pass  # written for a sequence model of another shape, start over
+        self.dirty = False
+
+    def snapshot(self):
+        return {
+            "text": self.output_text,
+            "score": self.game_score,
+            "target": self.current_target_sign,
+        }
+
+    # --- Transcript ---
+
+    def commit(self, char, probabilities=None, now=None):
+        """
+        :param char: Letter committed by the temporal smoother
+        :param probabilities: Averaged probability vector behind the commit,
+                              rescored by the decoder when one is configured
+        :param now: Commit timestamp in seconds (defaults to the wall clock)
+        """
+        if self.decoder is not None and probabilities is not None:
+            now = time.time() if now is None else now
+            # A pause between letters ends the word
+            if self.last_commit is not None and (now - self.last_commit) * 1000.0 >= self.decoder.word_gap_ms:
+                self.end_word()
+            self.last_commit = now
+            word = self.decoder.step(self.words, probabilities)
+            self.output_text = self.output_text[:self.word_start] + word
+        else:
+            self.output_text += char
+        self._trim()
+        self.dirty = True
+        self.publish("commit", char=char)
+        # The target is a single sign, so checking each commit is equivalent
+        # to searching the whole transcript
+        if self.current_target_sign and char.lower() == self.current_target_sign.lower():
+            self._score_match()
+
+    def end_word(self):
+        """
+        Finalises the current word with the decoder's best complete
+        hypothesis and starts a new one after a space.
+        """
+        word = None
+        if self.words is not None:
+            word = self.decoder.finish(self.words)
+            self.output_text = self.output_text[:self.word_start] + word
+        self.last_commit = None
+        if self.output_text and not self.output_text.endswith(" "):
+            self.output_text += " "
+        self._trim()
+        self.word_start = len(self.output_text)
+        self.dirty = True
+        self.publish("word", word=word)
+
+    def _trim(self):
+        if self.max_text_length and len(self.output_text) > self.max_text_length:
+            removed = len(self.output_text) - self.max_text_length
+            self.output_text = self.output_text[removed:]
+            self.word_start = max(0, self.word_start - removed)
+
+    def _reset_words(self):
+        self.word_start = 0
+        self.last_commit = None
+        if self.words is not None:
+            self.words = self.decoder.new_state()
+
+    def clear_text(self):
+        self.output_text = ""
+        self._reset_words()
+        self.dirty = True
+        self.publish("clear")
+
+    # --- Game ---
+
+    def _score_match(self):
+        self.game_score += 1
+        self.output_text = ""  # Clear text after successful match
+        self._reset_words()
+        self.match_pending = True
+        self.publish("game", match=True, target=self.current_target_sign)
+
+    def new_target(self, available_signs):
+        if not available_signs:
+            return None
+        self.current_target_sign = random.choice(available_signs)
+        self.dirty = True
+        self.publish("game", match=False, target=self.current_target_sign)
+        if self.current_target_sign.lower() in self.output_text.lower():
+            self._score_match()
+        return self.current_target_sign
+
+    def check_game(self):
+        """
+        :return: True once for every match scored since the last call; the
+                 score was incremented and the transcript cleared at commit time
+        """
+        match = self.match_pending
+        if match:
+            self.match_pending = False
+            self.dirty = True
+        return match
+
+    def approx_size(self):
+        """
+        :return: Rough memory footprint in bytes, used for the store's memory cap
+        """
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self.output_text)
+            + sys.getsizeof(self.trackers)
+            + sum(sys.getsizeof(t) + t.nbytes() for t in self.trackers.values())
+            + sum(sys.getsizeof(s) + s.nbytes() for s in self.streams.values())
+            + (self.words.nbytes() if self.words is not None else 0)
+        )
+
+
+class SessionStore:
+    """
+    In-process store of RecognitionSessions keyed by client session ID.
+
+    Sessions are kept in LRU order and evicted when idle for longer than
+    `ttl_seconds`, when there are more than `max_sessions`, or when their
+    approximate total size exceeds `max_bytes`. Sessions with /events
+    subscribers are never evicted.
+    """
+
+    def __init__(self, factory, max_sessions=10000, ttl_seconds=1800, max_bytes=None):
+        """
+        :param factory: Callable creating a new RecognitionSession
+        """
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.created = 0
+        self.evictions = {"ttl": 0, "lru": 0, "memory": 0}
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def get(self, session_id):
+        """
+        Returns the session for `session_id`, creating it if needed, and
+        marks it as most recently used.
+        """
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = self.factory()
+                self.created += 1
+            else:
+                self._sessions.move_to_end(session_id)
+            session.last_seen = now
+            self._evict(now, keep=session_id)
+        return session
+
+    def touch(self, session_id, session):
+        """
+        Refreshes the memory accounting of a session after a request changed it.
+        """
+        with self._lock:
+            if self._sessions.get(session_id) is not session:
+                return
+            size = session.approx_size()
+            self.total_bytes += size - session.size
+            session.size = size
+            self._evict(time.monotonic(), keep=session_id)
+
+    def _remove(self, session_id, reason):
+        session = self._sessions.pop(session_id)
+        self.total_bytes -= session.size
+        self.evictions[reason] += 1
+
+    def _evict(self, now, keep=None):
+        # Oldest sessions are at the front of the LRU order
+        for _ in range(len(self._sessions)):
+            session_id, session = next(iter(self._sessions.items()))
+            if session_id == keep:
+                break
+            if self.ttl_seconds and now - session.last_seen > self.ttl_seconds:
+                reason = "ttl"
+            elif len(self._sessions) > self.max_sessions:
+                reason = "lru"
+            elif self.max_bytes and self.total_bytes > self.max_bytes:
+                reason = "memory"
+            else:
+                break
+            if session.subscribers:
+                # An open /events stream counts as use: evicting would leave it
+                # on an orphaned object while new requests create another
+                session.last_seen = now
+                self._sessions.move_to_end(session_id)
+            else:
+                self._remove(session_id, reason)
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "approx_bytes": self.total_bytes,
+                "created": self.created,
+                "evictions": dict(self.evictions),
+            }
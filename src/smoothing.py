@@ -0,0 +1,124 @@
+import time
+import numpy as np
+
+
+class TemporalSmoother:
+    """
+    Averages the classifier's probability vectors over time and commits a
+    label once the averaged confidence stays above `threshold` for
+    `dwell_ms` milliseconds.
+
+    Unlike counting identical argmax frames, commit latency does not depend
+    on the frame rate and low-confidence frames do not count as agreement.
+    The averaging state lives in preallocated arrays updated in place.
+
+    Modes:
+      - "ema": exponential moving average with weight `alpha` for the newest frame
+      - "window": mean of the last `window` frames, kept in a ring buffer
+    """
+
+    __slots__ = (
+        "mode", "alpha", "threshold", "dwell_ms", "buffer", "total", "average",
+        "index", "count", "label", "confidence", "candidate_since",
+    )
+
+    def __init__(self, num_classes, mode="ema", window=8, alpha=0.35, threshold=0.8, dwell_ms=300):
+        if mode not in ("ema", "window"):
+            raise ValueError(f"Unknown smoothing mode '{mode}', expected 'ema' or 'window'")
+        self.mode = mode
+        self.alpha = alpha
+        self.threshold = threshold
+        self.dwell_ms = dwell_ms
+        self.buffer = np.zeros((window, num_classes), dtype=np.float32) if mode == "window" else None
+        self.total = np.zeros(num_classes, dtype=np.float64) if mode == "window" else None
+        self.average = np.zeros(num_classes, dtype=np.float32)
+        self.index = 0
+        self.count = 0
+        self.label = None
+        self.confidence = 0.0
+        self.candidate_since = None
+
+    def update(self, probabilities, now=None):
+        """
+        :param probabilities: Probability vector of the current frame
+        :param now: Frame timestamp in seconds (defaults to the wall clock)
+        :return: Committed class index, or None
+        """
+        now = time.time() if now is None else now
+
+        if self.mode == "ema":
+            if self.count == 0:
+                self.average[:] = probabilities
+            else:
+                self.average *= 1.0 - self.alpha
+                self.average += self.alpha * np.asarray(probabilities, dtype=np.float32)
+            self.count = 1
+        else:
+            slot = self.buffer[self.index]
+            self.total -= slot
+            slot[:] = probabilities
+            self.total += slot
+            self.index = (self.index + 1) % len(self.buffer)
+            self.count = min(self.count + 1, len(self.buffer))
+            np.divide(self.total, self.count, out=self.average, casting="unsafe")
+
+        label = int(self.average.argmax())
+        self.confidence = float(self.average[label])
+        if label != self.label or self.confidence < self.threshold:
+            # Dwell time only accumulates while the same label stays confident
+            self.label = label
+            self.candidate_since = now if self.confidence >= self.threshold else None
+            return None
+
+        if self.candidate_since is None:
+            self.candidate_since = now
+        if (now - self.candidate_since) * 1000.0 >= self.dwell_ms:
+            self.candidate_since = now  # a repeated letter needs another full dwell
+            return label
+        return None
+
+    def dwell(self, now=None):
+        """
+        :return: Milliseconds the current label has been held above the threshold
+        """
+        if self.candidate_since is None:
+            return 0.0
+        now = time.time() if now is None else now
+        return (now - self.candidate_since) * 1000.0
+
+    def reset(self):
+        if self.buffer is not None:
+            self.buffer.fill(0.0)
+            self.total.fill(0.0)
+        self.average.fill(0.0)
+        self.index = 0
+        self.count = 0
+        self.label = None
+        self.confidence = 0.0
+        self.candidate_since = None
+
+    def nbytes(self):
+        arrays = (self.buffer, self.total, self.average)
+        return sum(a.nbytes for a in arrays if a is not None)
+
+    def to_state(self):
+        return {
+            "buffer": self.buffer.tolist() if self.buffer is not None else None,
+            "average": self.average.tolist(),
+            "index": self.index,
+            "count": self.count,
+            "label": self.label,
+            "since": self.candidate_since,
+        }
+
+    def load_state(self, state):
+        if self.buffer is not None and state.get("buffer") is not None:
+            self.buffer[:] = state["buffer"]
+            self.total[:] = self.buffer.sum(axis=0)
+        self.average[:] = state["average"]
+        self.index = state["index"]
+        self.count = state["count"]
+        self.label = state["label"]
+        self.candidate_since = state["since"]
+        if self.label is not None:
+            self.confidence = float(self.average[self.label])
@@ -0,0 +1,266 @@
+import json
+import queue
+import select
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+from .session import SessionStore
+
+
+class InProcessBackend:
+    """
+    Keeps sessions in this process's SessionStore. Fastest option, but every
+    gunicorn worker has its own copy, so clients need sticky routing.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def load(self, session_id):
+        return self.store.get(session_id)
+
+    def save(self, session_id, session):
+        self.store.touch(session_id, session)
+
+    def subscribe(self, session_id):
+        return _LocalSubscription(self.store.get(session_id))
+
+    def metrics(self):
+        return dict(self.store.metrics(), backend="memory")
+
+
+class _LocalSubscription:
+    def __init__(self, session):
+        self.session = session
+        self.queue = session.subscribe()
+
+    def get(self, timeout):
+        return self.queue.get(timeout=timeout)
+
+    def close(self):
+        self.session.unsubscribe(self.queue)
+
+
+class RedisError(Exception):
+    pass
+
+
+class RespConnection:
+    """
+    Minimal client for the Redis serialization protocol (RESP2), enough for
+    GET/SET/PUBLISH/SUBSCRIBE with pipelining. Works against Redis, Valkey,
+    KeyDB or any local stand-in speaking the same protocol.
+    """
+
+    def __init__(self, host, port, db=0, password=None, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.buffer = bytearray()
+        setup = []
+        if password:
+            setup.append(("AUTH", password))
+        if db:
+            setup.append(("SELECT", db))
+        if setup:
+            self.pipeline(setup)
+
+    @staticmethod
+    def encode(args):
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode("utf8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    def _fill(self):
+        chunk = self.sock.recv(65536)
+        if not chunk:
+            raise ConnectionError("Connection closed by server")
+        self.buffer += chunk
+
+    def _read_line(self):
+        while True:
+            end = self.buffer.find(b"\r\n")
+            if end >= 0:
+                line = bytes(self.buffer[:end])
+                del self.buffer[:end + 2]
+                return line
+            self._fill()
+
+    def _read_exact(self, n):
+        while len(self.buffer) < n:
+            self._fill()
+        data = bytes(self.buffer[:n])
+        del self.buffer[:n]
+        return data
+
+    def wait_readable(self, timeout):
+        return bool(self.buffer) or bool(select.select([self.sock], [], [], timeout)[0])
+
+    def read_reply(self):
+        line = self._read_line()
+        kind, payload = line[:1], line[1:]
+        if kind == b"+":
+            return payload.decode("utf8")
+        if kind == b"-":
+            return RedisError(payload.decode("utf8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            return self._read_exact(length + 2)[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self.read_reply() for _ in range(length)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def pipeline(self, commands):
+        """
+        Sends all commands in one write and reads all replies: one network
+        round trip however many commands there are.
+        """
+        self.sock.sendall(b"".join(self.encode(command) for command in commands))
+        replies = [self.read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RedisBackend:
+    """
+    Stores each session as one JSON value in a Redis-protocol server, so any
+    worker on any node can serve any client.
+
+    Per request the session is read with a single GET and written back with
+    a single pipelined SET (with TTL) plus a PUBLISH per event; /events
+    subscribers receive those events whichever worker produced them.
+    Only requests that changed the session save it; two such requests of one
+    session that overlap are last-write-wins, the later SET drops the
+    other's change.
+    """
+
+    def __init__(self, url, session_factory, ttl_seconds=1800, prefix="signdecode", pool_size=8):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.password = parsed.password
+        self.session_factory = session_factory
+        self.ttl_seconds = int(ttl_seconds)
+        self.prefix = prefix
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._metrics_lock = threading.Lock()
+        self.round_trips = 0
+        self.errors = 0
+
+    def _key(self, session_id):
+        return f"{self.prefix}:session:{session_id}"
+
+    def _channel(self, session_id):
+        return f"{self.prefix}:events:{session_id}"
+
+    def _connect(self, timeout=5.0):
+        return RespConnection(self.host, self.port, self.db, self.password, timeout=timeout)
+
+    def _execute(self, commands):
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            connection = self._connect()
+        try:
+            replies = connection.pipeline(commands)
+        except (OSError, ConnectionError):
+            connection.close()
+            with self._metrics_lock:
+                self.errors += 1
+            raise
+        except RedisError:
+            # Command error, the connection itself is still usable
+            self._release(connection)
+            with self._metrics_lock:
+                self.errors += 1
+            raise
+        with self._metrics_lock:
+            self.round_trips += 1
+        self._release(connection)
+        return replies
+
+    def _release(self, connection):
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def load(self, session_id):
+        session = self.session_factory()
+        raw = self._execute([("GET", self._key(session_id))])[0]
+        if raw is not None:
+            session.load_state(json.loads(raw))
+        session.outbox = []
+        return session
+
+    def save(self, session_id, session):
+        commands = [("SET", self._key(session_id), json.dumps(session.to_state()), "EX", self.ttl_seconds)]
+        for event in session.outbox or ():
+            commands.append(("PUBLISH", self._channel(session_id), json.dumps(event)))
+        session.outbox = []
+        self._execute(commands)
+
+    def subscribe(self, session_id):
+        return _RedisSubscription(self._connect(), self._channel(session_id))
+
+    def metrics(self):
+        return {
+            "backend": "redis",
+            "round_trips": self.round_trips,
+            "errors": self.errors,
+        }
+
+
+class _RedisSubscription:
+    def __init__(self, connection, channel):
+        self.connection = connection
+        self.connection.sock.sendall(RespConnection.encode(("SUBSCRIBE", channel)))
+        self.connection.read_reply()  # subscribe confirmation
+        # Connecting and subscribing use the normal timeout; from here on the
+        # socket only waits for messages, which get() bounds with select()
+        self.connection.sock.settimeout(None)
+
+    def get(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.connection.wait_readable(remaining):
+                raise queue.Empty
+            reply = self.connection.read_reply()
+            if isinstance(reply, list) and reply and reply[0] == b"message":
+                return json.loads(reply[2])
+
+    def close(self):
+        self.connection.close()
+
+
+def create_state_backend(kind, session_factory, redis_url=None, max_sessions=10000,
+                         ttl_seconds=1800, max_bytes=None):
+    """
+    :param kind: "memory" (in-process SessionStore) or "redis"
+    """
+    if kind == "memory":
+        return InProcessBackend(SessionStore(session_factory, max_sessions=max_sessions,
+                                             ttl_seconds=ttl_seconds, max_bytes=max_bytes))
+    if kind == "redis":
+        return RedisBackend(redis_url, session_factory, ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown state backend '{kind}', expected 'memory' or 'redis'")
@@ -36,8 +36,8 @@ let currentTarget = null;
 let gameActive = false;
 let outputText = "";
 let lastPredictedLabel = null;
-let frameCount = 0;
-const THRESHOLD_FRAMES = 15;
+let candidateSince = null;
+const COMMIT_DWELL_MS = 300; // same dwell as the server's SIGNDECODE_COMMIT_DWELL_MS default
 
 const textBox = document.getElementById('recognizedText');
 const scoreEl = document.getElementById('gameScore');
@@ -212,18 +212,18 @@ function onResults(results) {
 
             const predicted = recognizeSign(landmarks, handedness);
             if (predicted) {
-                // Stability logic
-                if (predicted === lastPredictedLabel) {
-                    frameCount++;
-                } else {
-                    frameCount = 0;
+                // Stability logic: commit once the sign is held for COMMIT_DWELL_MS,
+                // independent of the camera's frame rate
+                const now = performance.now();
+                if (predicted !== lastPredictedLabel) {
+                    candidateSince = now;
                     lastPredictedLabel = predicted;
                 }
 
-                if (frameCount >= THRESHOLD_FRAMES) {
+                if (now - candidateSince >= COMMIT_DWELL_MS) {
                     outputText += predicted;
                     textBox.innerText = outputText;
-                    frameCount = 0;
+                    candidateSince = now;
 
                     // Game Check
                     if (gameActive && predicted === currentTarget) {
@@ -2,10 +2,11 @@ import cv2
 import tkinter as tk
 from tkinter import Label, Button, StringVar
 from PIL import Image, ImageTk
-import numpy as np
-from utils import extract_keypoints
+from utils import extract_keypoints_batch, hand_labels
+from smoothing import TemporalSmoother
 from text_to_speech import TextToSpeech
 import mediapipe as mp
+import config
 
 class SignLanguageApp:
     def __init__(self, cap, model, hands, mp_draw, labels):
@@ -15,9 +16,7 @@ class SignLanguageApp:
         self.mp_draw = mp_draw
         self.labels = labels
         self.text_output = ""  # Initialize empty text
-        self.last_predicted_label = None
-        self.threshold_frames = 15  # Number of frames before adding a new letter
-        self.frame_count = 0
+        self.trackers = {}  # handedness -> TemporalSmoother
         self.tts = TextToSpeech()
         
         # Initialize UI
@@ -72,31 +71,33 @@ class SignLanguageApp:
             for hand_landmarks in results.multi_hand_landmarks:
                 self.mp_draw.draw_landmarks(frame, hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS)
 
-                keypoints = extract_keypoints(hand_landmarks)
-                prediction = self.model.predict(np.expand_dims(keypoints, axis=0), verbose=0)
-                predicted_label = np.argmax(prediction)
-                letter = self.labels.get(predicted_label, "?")
+            # Classify every detected hand in a single model call
+            keypoints = extract_keypoints_batch(results.multi_hand_landmarks)
+            probabilities = self.model.predict_batch(keypoints)
+
+            for handedness, hand_probabilities in zip(hand_labels(results), probabilities):
+                # ✅ Each hand keeps its own temporal smoother
+                tracker = self.trackers.get(handedness)
+                if tracker is None:
+                    tracker = self.trackers[handedness] = TemporalSmoother(
+                        len(self.labels),
+                        mode=config.SMOOTHING_MODE,
+                        window=config.SMOOTHING_WINDOW,
+                        alpha=config.SMOOTHING_ALPHA,
+                        threshold=config.COMMIT_THRESHOLD,
+                        dwell_ms=config.COMMIT_DWELL_MS
+                    )
 
                 # 🔹 Debugging logs
-                # print(f"Predicted Letter: {letter}")
-                # print(f"Last Label: {self.last_predicted_label}, Frame Count: {self.frame_count}")
+                # print(f"Predicted Letter: {self.labels.get(tracker.label, '?')} ({handedness})")
 
-                # ✅ If the same gesture is detected continuously, increment frame count
-                if predicted_label == self.last_predicted_label:
-                    self.frame_count += 1
-                else:
-                    self.frame_count = 0  # Reset only if a new letter appears
-
-                # ✅ Update text only after threshold frames
-                if self.frame_count >= self.threshold_frames:
+                # ✅ Update text only once the averaged prediction was held long enough
+                committed = tracker.update(hand_probabilities)
+                if committed is not None:
+                    letter = self.labels.get(committed, "?")
                     self.text_output += letter
                     self.detected_text.set(self.text_output)  # Update UI
                     self.label_text.update_idletasks()  # Refresh UI
-                    
-                    self.frame_count = 0  # Reset counter after adding letter
-
-                # ✅ Update last predicted label correctly
-                self.last_predicted_label = predicted_label  # Move this outside
 
         # Convert OpenCV image to Tkinter format
         img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))  
@@ -9,3 +9,67 @@ def extract_keypoints(hand_landmarks):
     """
     keypoints = np.array([[lm.x, lm.y, lm.z] for lm in hand_landmarks.landmark]).flatten()
     return keypoints
+
+def extract_keypoints_batch(multi_hand_landmarks):
+    """
+    Stacks the keypoints of every detected hand so they can be classified in one call.
+
+    :param multi_hand_landmarks: List of Mediapipe hand landmarks objects
+    :return: float32 numpy array of shape (n_hands, 63)
+    """
+    keypoints = np.empty((len(multi_hand_landmarks), 63), dtype=np.float32)
+    for i, hand_landmarks in enumerate(multi_hand_landmarks):
+        keypoints[i] = extract_keypoints(hand_landmarks)
+    return keypoints
+
+def hand_labels(results):
+    """
+    Returns the handedness ('Left'/'Right') of each detected hand, falling back
+    to the hand index when Mediapipe did not report it.
+
+    :param results: Mediapipe Hands process() result
+    :return: List of strings, one per hand in results.multi_hand_landmarks
+    """
+    handedness = getattr(results, "multi_handedness", None) or []
+    labels = [h.classification[0].label for h in handedness]
+    if len(labels) != len(results.multi_hand_landmarks):
+        return [str(i) for i in range(len(results.multi_hand_landmarks))]
+    return labels
+
+def parse_landmark_hands(data):
+    """
+    Parses a /predict_landmarks request body into classifier input.
+
+    Accepts {"hands": [{"landmarks": [[x, y, z] * 21], "handedness": "Left"}, ...]}
+    or a single hand at the top level. Set "mirrored": true when the landmarks
+    come from an un-flipped camera image (the browser's raw video); x is then
+    flipped to match the mirrored frames the model was trained on, and the
+    handedness label is swapped accordingly.
+
+    :param data: Decoded JSON body
+    :return: (float32 array of shape (n_hands, 63), list of handedness labels)
+    """
+    if not isinstance(data, dict):
+        raise ValueError("body must be a JSON object")
+    hands = data.get("hands")
+    if hands is None:
+        hands = [data] if "landmarks" in data else []
+    if not isinstance(hands, list):
+        raise ValueError("'hands' must be a list")
+
+    mirrored = bool(data.get("mirrored", False))
+    keypoints = np.empty((len(hands), 21, 3), dtype=np.float32)
+    handedness = []
+    for i, hand in enumerate(hands):
+        try:
+            keypoints[i] = np.asarray(hand["landmarks"], dtype=np.float32).reshape(21, 3)
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"hand {i}: 'landmarks' must be 21 [x, y, z] points")
+        label = str(hand.get("handedness", i))
+        if mirrored:
+            label = {"Left": "Right", "Right": "Left"}.get(label, label)
+        handedness.append(label)
+
+    if mirrored:
+        keypoints[:, :, 0] = 1.0 - keypoints[:, :, 0]
+    return keypoints.reshape(len(hands), 63), handedness
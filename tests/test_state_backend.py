@@ -0,0 +1,232 @@
+"""
+RedisBackend and RespConnection against an in-process stand-in that speaks
+the subset of RESP2 the backend uses, so no Redis server is needed.
+"""
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from src.session import RecognitionSession
+from src.smoothing import TemporalSmoother
+from src.state_backend import RedisBackend, RedisError, RespConnection
+
+
+class FakeRedis:
+    """
+    Threaded TCP server implementing AUTH, SELECT, GET, SET [EX], PUBLISH and SUBSCRIBE.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+        self.commands = []
+        self.subscribers = {}  # channel -> sockets
+        self.lock = threading.Lock()
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def close(self):
+        self.server.close()
+
+    def _accept(self):
+        while True:
+            try:
+                connection, _ = self.server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection):
+        reader = connection.makefile("rb")
+        try:
+            while True:
+                line = reader.readline()
+                if not line:
+                    return
+                args = []
+                for _ in range(int(line[1:])):
+                    length = int(reader.readline()[1:])
+                    args.append(reader.read(length + 2)[:-2])
+                connection.sendall(self._execute(connection, args))
+        except (OSError, ValueError):
+            pass
+        finally:
+            connection.close()
+
+    def _execute(self, connection, args):
+        command = args[0].decode().upper()
+        with self.lock:
+            self.commands.append([command] + args[1:])
+            if command in ("AUTH", "SELECT"):
+                return b"+OK\r\n"
+            if command == "GET":
+                value = self.data.get(args[1])
+                return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+            if command == "SET":
+                self.data[args[1]] = args[2]
+                if len(args) == 5 and args[3].upper() == b"EX":
+                    self.expiry[args[1]] = int(args[4])
+                return b"+OK\r\n"
+            if command == "PUBLISH":
+                receivers = self.subscribers.get(args[1], [])
+                for receiver in receivers:
+                    receiver.sendall(RespConnection.encode((b"message", args[1], args[2])))
+                return b":%d\r\n" % len(receivers)
+            if command == "SUBSCRIBE":
+                self.subscribers.setdefault(args[1], []).append(connection)
+                return RespConnection.encode((b"subscribe", args[1], b"1"))
+        return b"-ERR unknown command '%s'\r\n" % command.encode()
+
+
+@pytest.fixture
+def server():
+    fake = FakeRedis()
+    yield fake
+    fake.close()
+
+
+def new_session():
+    return RecognitionSession(lambda: TemporalSmoother(4, threshold=0.5, dwell_ms=0))
+
+
+def test_pipeline_replies(server):
+    connection = RespConnection("127.0.0.1", server.port)
+    assert connection.pipeline([("SET", "k", "v"), ("GET", "k"), ("GET", "missing")]) == ["OK", b"v", None]
+    with pytest.raises(RedisError):
+        connection.pipeline([("NOPE",)])
+    assert connection.pipeline([("GET", "k")]) == [b"v"]  # still usable after a command error
+    connection.close()
+
+
+def test_auth_and_database_from_url(server):
+    backend = RedisBackend(f"redis://:secret@127.0.0.1:{server.port}/2", new_session)
+    backend.load("a")
+    assert ["AUTH", b"secret"] in server.commands
+    assert ["SELECT", b"2"] in server.commands
+
+
+def test_load_save_round_trip(server):
+    backend = RedisBackend(f"redis://127.0.0.1:{server.port}", new_session, ttl_seconds=60)
+    session = backend.load("abc")
+    assert session.output_text == ""
+
+    session.tracker("Right").update(np.array([0.9, 0.1, 0.0, 0.0]), now=1.0)
+    session.commit("A")
+    session.new_target(["B"])
+    backend.save("abc", session)
+    assert server.expiry[b"signdecode:session:abc"] == 60
+
+    restored = backend.load("abc")
+    assert restored.output_text == "A"
+    assert restored.current_target_sign == "B"
+    assert restored.tracker("Right").to_state() == session.tracker("Right").to_state()
+    assert backend.metrics()["round_trips"] == 3
+
+
+def test_events_reach_subscribers(server, monkeypatch):
+    timeouts = []
+    create_connection = socket.create_connection
+
+    def recording_create_connection(address, timeout=None):
+        timeouts.append(timeout)
+        return create_connection(address, timeout=timeout)
+
+    monkeypatch.setattr(socket, "create_connection", recording_create_connection)
+    backend = RedisBackend(f"redis://127.0.0.1:{server.port}", new_session)
+    subscription = backend.subscribe("abc")
+    # Connecting is bounded by the normal timeout, only reads wait without one
+    assert timeouts == [5.0]
+    assert subscription.connection.sock.gettimeout() is None
+    try:
+        with pytest.raises(queue.Empty):
+            subscription.get(timeout=0.05)
+
+        session = backend.load("abc")
+        session.commit("C")
+        backend.save("abc", session)
+        event = subscription.get(timeout=2.0)
+        assert event["type"] == "commit"
+        assert event["char"] == "C"
+        assert event["text"] == "C"
+        assert json.loads(server.data[b"signdecode:session:abc"])["text"] == "C"
+    finally:
+        subscription.close()
+
+
+def test_last_save_wins_per_request(server):
+    backend = RedisBackend(f"redis://127.0.0.1:{server.port}", new_session)
+    first = backend.load("abc")
+    first.commit("A")
+    backend.save("abc", first)
+
+    # A later load sees the earlier save, as the WebSocket loop relies on
+    second = backend.load("abc")
+    second.clear_text()
+    backend.save("abc", second)
+    assert backend.load("abc").output_text == ""
+
+
+class FakeWebSocket:
+    """
+    Stands in for flask-sock's simple_websocket.Server, replaying queued messages.
+    """
+    messages = []
+
+    def __init__(self, environ, **options):
+        self.inbox = list(self.messages)
+        self.sent = []
+        self.mode = "werkzeug"
+
+    def receive(self, timeout=None):
+        return self.inbox.pop(0) if self.inbox else None
+
+    def send(self, data):
+        self.sent.append(json.loads(data))
+
+    def close(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture
+def app_module(server, monkeypatch):
+    pytest.importorskip("flask_sock")
+    from src import app as app_module
+    backend = RedisBackend(f"redis://127.0.0.1:{server.port}", new_session)
+    monkeypatch.setattr(app_module, "state_backend", backend)
+    monkeypatch.setattr(app_module, "model_ready", lambda: True)
+    return app_module
+
+
+def test_websocket_close_keeps_stream_saves(server, app_module, monkeypatch):
+    import flask_sock
+    seeded = new_session()
+    seeded.commit("H")
+    app_module.state_backend.save("abc", seeded)
+
+    monkeypatch.setattr(flask_sock, "Server", FakeWebSocket)
+    monkeypatch.setattr(FakeWebSocket, "messages", [json.dumps({"type": "clear"})])
+    client = app_module.app.test_client()
+    client.get("/ws?session_id=abc", headers={"Upgrade": "websocket", "Connection": "Upgrade"})
+
+    # The connect-time copy ("H") must not be written back when the socket closes
+    assert app_module.state_backend.load("abc").output_text == ""
+
+
+def test_read_only_requests_do_not_save(server, app_module):
+    client = app_module.app.test_client()
+    headers = {"X-Session-ID": "abc"}
+    assert client.get("/status", headers=headers).get_json() == {"text": ""}
+    client.get("/game_status", headers=headers)
+    assert not any(command[0] == "SET" for command in server.commands)
+
+    # Requests that change the session still save it, once
+    client.post("/add_space", headers=headers)
+    assert [command[0] for command in server.commands].count("SET") == 1
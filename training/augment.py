@@ -0,0 +1,139 @@
+"""
+Vectorized keypoint augmentation, applied to whole batches on the fly.
+
+Every transform works on (N, 21, 3) landmark arrays with one random draw per
+row, so a batch costs a handful of NumPy calls whatever its size. Nothing is
+written to disk; train_model.py runs it inside the tf.data pipeline.
+
+Usage:
+    python training/augment.py --benchmark [--batch-size 256]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+class Augmenter:
+    """
+    Random in-plane rotation, scale and translation around the hand's
+    centroid, depth jitter, mirroring and per-joint noise.
+
+    Mirroring flips x around the centroid, which turns a right hand into a
+    left one; the classifier has no handedness input, so the swap needs no
+    label change. With `handedness` passed to augment(), the flags of
+    mirrored rows are flipped too.
+    """
+
+    def __init__(self, rotation_deg=15.0, scale=(0.9, 1.1), translation=0.05, depth_jitter=0.2,
+                 mirror_probability=0.5, joint_noise=0.004, seed=None):
+        """
+        :param rotation_deg: Maximum in-plane rotation in degrees
+        :param scale: Range of the uniform scale factor
+        :param translation: Maximum x/y shift in normalised image coordinates
+        :param depth_jitter: Maximum relative change of the z spread
+        :param mirror_probability: Share of rows mirrored horizontally
+        :param joint_noise: Standard deviation of the Gaussian noise added to every joint
+        """
+        self.rotation = np.deg2rad(rotation_deg)
+        self.scale = scale
+        self.translation = translation
+        self.depth_jitter = depth_jitter
+        self.mirror_probability = mirror_probability
+        self.joint_noise = joint_noise
+        self.rng = np.random.default_rng(seed)
+
+    def augment(self, keypoints, handedness=None):
+        """
+        :param keypoints: Array of shape (N, 63) or (N, 21, 3), interleaved x, y, z
+        :param handedness: Optional bool array (True = right hand), flipped for mirrored rows
+        :return: Augmented float32 array of the input shape (and the handedness when given)
+        """
+        shape = np.shape(keypoints)
+        points = np.array(keypoints, dtype=np.float32).reshape(-1, 21, 3)
+        n = len(points)
+        rng = self.rng
+
+        centroid = points.mean(axis=1, keepdims=True)
+        points -= centroid
+
+        # Rotation and scale in the image plane, one angle and factor per row
+        angle = rng.uniform(-self.rotation, self.rotation, (n, 1))
+        scale = rng.uniform(self.scale[0], self.scale[1], (n, 1))
+        cos = (np.cos(angle) * scale).astype(np.float32)
+        sin = (np.sin(angle) * scale).astype(np.float32)
+        x, y = points[:, :, 0].copy(), points[:, :, 1].copy()
+        points[:, :, 0] = cos * x - sin * y
+        points[:, :, 1] = sin * x + cos * y
+
+        # Depth: MediaPipe's z is relative to the wrist and noisier than x/y
+        points[:, :, 2] *= scale * rng.uniform(1.0 - self.depth_jitter, 1.0 + self.depth_jitter, (n, 1))
+
+        mirrored = rng.random(n) < self.mirror_probability
+        points[mirrored, :, 0] *= -1.0
+
+        centroid[:, :, :2] += rng.uniform(-self.translation, self.translation, (n, 1, 2))
+        points += centroid
+        points += rng.standard_normal(points.shape, dtype=np.float32) * np.float32(self.joint_noise)
+
+        points = points.reshape(shape)
+        if handedness is None:
+            return points
+        return points, np.where(mirrored, ~np.asarray(handedness, dtype=bool), handedness)
+
+    def __call__(self, features, labels):
+        """
+        Batch transform for dataset_cache.make_tf_dataset().
+        """
+        return self.augment(features), labels
+
+
+def benchmark(augmenter, dataset=None, batch_size=256, seconds=2.0):
+    """
+    Measures augmentation throughput and, with a dataset, the memory-mapped
+    read rate alone and with augmentation, i.e. what the input pipeline can
+    feed the training loop.
+
+    :return: dict of rows per second
+    """
+    def rate(step):
+        rows, start = 0, time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            rows += step()
+        return rows / (time.perf_counter() - start)
+
+    batch = np.random.default_rng(0).random((batch_size, 63), dtype=np.float32)
+    results = {"augment": rate(lambda: len(augmenter.augment(batch)))}
+    if dataset is not None:
+        from dataset_cache import batches
+        indices = np.arange(min(len(dataset), batch_size * 16))
+        results["read"] = rate(lambda: sum(
+            len(labels) for _, labels in batches(dataset, indices, batch_size, shuffle=True)))
+        results["read + augment"] = rate(lambda: sum(
+            len(augmenter(*batch)[1]) for batch in batches(dataset, indices, batch_size, shuffle=True)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keypoint augmentation")
+    parser.add_argument("--benchmark", action="store_true", help="Measure throughput and exit")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--data", default=None, help="Also time reads from this dataset's cache")
+    args = parser.parse_args()
+
+    augmenter = Augmenter(seed=0)
+    if args.benchmark:
+        dataset = None
+        if args.data:
+            from dataset_cache import build_cache
+            dataset = build_cache(args.data)
+        for name, value in benchmark(augmenter, dataset, args.batch_size).items():
+            print(f"{name:16}{value:>14,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
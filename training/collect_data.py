@@ -1,20 +1,17 @@
 import cv2
 import mediapipe as mp
 import numpy as np
-import pandas as pd
 import os
 import time
 import sys
 sys.path.append('..')
 from src.labels import labels  # Import from src
+from dataset_shards import ShardWriter
 
-# Dataset folder and file
+# Dataset folder: each recording is appended as its own shard, see dataset_shards.py
 dataset_folder = "training/dataset"
-os.makedirs(dataset_folder, exist_ok=True)
-dataset_path = os.path.join(dataset_folder, "sign_data.csv")
-
-# Define column names
-columns = [f"x{i}" for i in range(21)] + [f"y{i}" for i in range(21)] + [f"z{i}" for i in range(21)] + ["label"]
+shards_path = os.path.join(dataset_folder, "shards")
+writer = ShardWriter(shards_path, signer=os.environ.get("SIGNDECODE_SIGNER"))
 
 # Open webcam
 cap = cv2.VideoCapture(0)
@@ -61,7 +58,6 @@ while True:
                 keypoints = []
                 for landmark in hand_landmarks.landmark:
                     keypoints.extend([landmark.x, landmark.y, landmark.z])
-                keypoints.append(label)
                 data_list.append(keypoints)
         
         # Display recording status and frame count on camera window
@@ -75,16 +71,10 @@ while True:
     
     print(f"Recording for '{label}' complete!")
     
-    # Check if CSV exists and is not empty
-    if os.path.exists(dataset_path) and os.path.getsize(dataset_path) > 0:
-        existing_df = pd.read_csv(dataset_path)
-        df = pd.DataFrame(data_list, columns=columns)
-        df = pd.concat([existing_df, df], ignore_index=True)
-    else:
-        df = pd.DataFrame(data_list, columns=columns)  # Create a new DataFrame if empty
-
-    df.to_csv(dataset_path, index=False)
-    print(f"Dataset updated at {dataset_path}")
+    # Append the recording as a new shard; earlier data is never rewritten
+    entry = writer.write(np.array(data_list, dtype=np.float32), int(label_index))
+    if entry:
+        print(f"Dataset updated: {entry['rows']} rows in {os.path.join(shards_path, entry['shard'])}")
 
 cap.release()
 cv2.destroyAllWindows()
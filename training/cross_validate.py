@@ -0,0 +1,203 @@
+"""
+Grouped cross-validation for the sign classifier.
+
+Frames of one recording are nearly identical, so a random frame split puts
+copies of the training data into validation. Here every fold holds out whole
+recordings, collection sessions or signers, and folds train in parallel
+worker processes on the shared memory-mapped dataset cache.
+
+Grouped splits need several recordings (sessions, signers) per sign, i.e.
+the shard dataset written by collect_data.py or ingest.py. A legacy CSV with
+one recording per sign is refused: each fold would validate only on signs it
+never trained on.
+
+Usage:
+    python training/cross_validate.py --by recording --folds 5
+    python training/cross_validate.py --by signer
+    python training/cross_validate.py --by frame   # leaky baseline for comparison
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from src.labels import labels
+from dataset_cache import CachedDataset, build_cache, default_source, groups_confounded
+from sweep import _init_worker, core_sets
+
+
+def row_groups(dataset, by):
+    """
+    :param by: "recording", "session", "signer" or "frame"
+    :return: Group id per row; rows sharing an id are never split across folds
+    """
+    if by == "frame":
+        return np.arange(len(dataset))
+    groups = np.asarray(dataset.groups)
+    if by == "recording":
+        return groups
+    key = {"session": "group_session", "signer": "group_signer"}[by]
+    if key not in dataset.meta:
+        raise ValueError(f"The dataset has no {by} metadata, it was not built from shards")
+    values = dataset.meta[key]
+    codes = {value: i for i, value in enumerate(dict.fromkeys(values))}
+    return np.array([codes[v] for v in values], dtype=np.int32)[groups]
+
+
+def make_folds(groups, folds, seed=42):
+    """
+    Assigns whole groups to folds, balancing the number of rows per fold.
+
+    :return: List of (train indices, validation indices)
+    """
+    unique, sizes = np.unique(groups, return_counts=True)
+    order = np.random.default_rng(seed).permutation(len(unique))
+    order = order[np.argsort(-sizes[order], kind="stable")]  # largest first, random among ties
+    fold_of_group = np.empty(len(unique), dtype=np.int32)
+    fold_rows = np.zeros(folds, dtype=np.int64)
+    for g in order:
+        fold = int(fold_rows.argmin())
+        fold_of_group[g] = fold
+        fold_rows[fold] += sizes[g]
+    row_fold = fold_of_group[np.searchsorted(unique, groups)]
+    return [(np.flatnonzero(row_fold != k), np.flatnonzero(row_fold == k)) for k in range(folds)]
+
+
+def run_fold(fold, train_idx, val_idx, cache_path, epochs, batch_size, augment):
+    """
+    Trains the default architecture on one fold.
+
+    :return: (fold, confusion matrix of the validation rows)
+    """
+    import tensorflow as tf
+    from augment import Augmenter
+    from dataset_cache import make_tf_dataset
+    from train_model import build_model
+
+    tf.keras.utils.set_random_seed(fold)
+    dataset = CachedDataset(cache_path)
+    augmenter = Augmenter(seed=fold) if augment else None
+    train_data = make_tf_dataset(dataset, train_idx, batch_size, shuffle=True, seed=fold, transform=augmenter)
+
+    model = build_model(dataset.num_features, len(labels))
+    model.fit(train_data, epochs=epochs, verbose=0)
+
+    X_val, y_val = dataset.rows(val_idx)
+    predictions = model.predict(X_val, batch_size=1024, verbose=0).argmax(axis=1)
+    confusion = np.bincount(y_val * len(labels) + predictions, minlength=len(labels) ** 2)
+    return fold, confusion.reshape(len(labels), len(labels))
+
+
+def summarize(confusions):
+    """
+    :param confusions: Per-fold confusion matrices (rows: true class, columns: predicted)
+    :return: Report with per-fold accuracy, per-class metrics and the summed confusion matrix
+    """
+    total = np.sum(confusions, axis=0)
+    fold_accuracy = [float(np.trace(c) / c.sum()) if c.sum() else 0.0 for c in confusions]
+    true_positives = np.diag(total).astype(np.float64)
+    support = total.sum(axis=1)
+    predicted = total.sum(axis=0)
+    precision = np.divide(true_positives, predicted, out=np.zeros_like(true_positives), where=predicted > 0)
+    recall = np.divide(true_positives, support, out=np.zeros_like(true_positives), where=support > 0)
+    f1 = np.divide(2 * precision * recall, precision + recall,
+                   out=np.zeros_like(true_positives), where=(precision + recall) > 0)
+    per_class = {
+        labels[i]: {"precision": float(precision[i]), "recall": float(recall[i]), "f1": float(f1[i]),
+                    "support": int(support[i])}
+        for i in range(len(labels)) if support[i]
+    }
+    return {
+        "accuracy": float(true_positives.sum() / total.sum()),
+        "fold_accuracy": fold_accuracy,
+        "fold_accuracy_std": float(np.std(fold_accuracy)),
+        "macro_f1": float(np.mean([m["f1"] for m in per_class.values()])),
+        "per_class": per_class,
+        "confusion_matrix": total.tolist(),
+        "class_names": [labels[i] for i in range(len(labels))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grouped, parallel cross-validation of the sign classifier")
+    parser.add_argument("--data", default=None, help="Shard directory or CSV (default: shards, else sign_data.csv)")
+    parser.add_argument("--by", choices=["recording", "session", "signer", "frame"], default="recording",
+                        help="Unit held out together; 'frame' is the leaky random split")
+    parser.add_argument("--folds", type=int, default=None, help="Number of folds (default: 5, one per signer with --by signer)")
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--no-augment", action="store_true")
+    parser.add_argument("--threads", type=int, default=1, help="Cores (and TF threads) per fold")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--report", default="models/cross_validation.json")
+    args = parser.parse_args()
+
+    dataset = build_cache(args.data or default_source())
+    groups = row_groups(dataset, args.by)
+    if args.by != "frame" and groups_confounded(groups, dataset.labels):
+        raise SystemExit(
+            f"⚠️ Every {args.by} group holds exactly one sign and every sign one group, so each fold would "
+            f"validate only on signs it never trained on. Grouped cross-validation needs several recordings "
+            f"per sign: record more with collect_data.py or ingest.py into the shard dataset "
+            f"(or use --by frame for the leaky baseline)."
+        )
+    n_groups = len(np.unique(groups))
+    folds = min(args.folds or (n_groups if args.by == "signer" else 5), n_groups)
+    if folds < 2:
+        raise SystemExit(f"⚠️ Only {n_groups} {args.by} group(s), cross-validation needs at least 2")
+    splits = make_folds(groups, folds)
+
+    # A class held by a single group is only ever validated on folds that never trained on it
+    label_array = np.asarray(dataset.labels)
+    for i, char in labels.items():
+        class_groups = len(np.unique(groups[label_array == i]))
+        if 0 < class_groups < 2:
+            print(f"⚠️ '{char}' appears in only {class_groups} {args.by} group, its fold has no training data for it")
+
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    workers = min(args.workers or max(1, cpus // args.threads), folds)
+    print(f"✅ {folds} folds by {args.by} ({n_groups} groups) on {workers} workers")
+
+    import multiprocessing
+    context = multiprocessing.get_context("spawn")
+    cores = context.Queue()
+    for core_set in core_sets(workers, args.threads):
+        cores.put(core_set)
+
+    confusions = [None] * folds
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                             initargs=(cores, args.threads)) as pool:
+        futures = [
+            pool.submit(run_fold, k, train_idx, val_idx, dataset.path, args.epochs, args.batch_size,
+                        not args.no_augment)
+            for k, (train_idx, val_idx) in enumerate(splits)
+        ]
+        for future in as_completed(futures):
+            fold, confusion = future.result()
+            confusions[fold] = confusion
+            print(f"✅ Fold {fold}: accuracy {np.trace(confusion) / confusion.sum():.4f} on {confusion.sum()} rows")
+
+    report = dict(summarize(confusions), by=args.by, folds=folds, groups=n_groups)
+    os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\nAccuracy {report['accuracy']:.4f} (fold std {report['fold_accuracy_std']:.4f}), "
+          f"macro F1 {report['macro_f1']:.4f}")
+    worst = sorted(report["per_class"].items(), key=lambda kv: kv[1]["f1"])[:5]
+    print("Weakest classes: " + ", ".join(f"{name} F1 {m['f1']:.2f}" for name, m in worst))
+    total = np.array(report["confusion_matrix"])
+    np.fill_diagonal(total, 0)
+    for flat in np.argsort(-total, axis=None)[:5]:
+        true, pred = divmod(int(flat), len(labels))
+        if total[true, pred]:
+            print(f"  {labels[true]} -> {labels[pred]}: {total[true, pred]} rows confused")
+    print(f"Report saved as '{args.report}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import sys
+import uuid
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from src.labels import labels
+from dataset_shards import MANIFEST, FEATURE_LAYOUT, read_manifest
+
+CACHE_ROOT = "training/dataset/cache"
+CACHE_FORMAT = 1
+
+
+def content_hash(source, dtype):
+    """
+    Cache key of a dataset: the CSV bytes, or the shard manifest, which
+    changes with every appended shard since shards are never rewritten.
+    """
+    digest = hashlib.sha256(f"v{CACHE_FORMAT}:{np.dtype(dtype).name}:".encode("utf8"))
+    path = os.path.join(source, MANIFEST) if os.path.isdir(source) else source
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+class CachedDataset:
+    """
+    Memory-mapped view of a converted dataset. Rows are only read from disk
+    when a batch touches them, so opening a dataset is instant whatever its size.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.features = np.load(os.path.join(path, "features.npy"), mmap_mode="r")
+        self.labels = np.load(os.path.join(path, "labels.npy"), mmap_mode="r")
+        self.groups = np.load(os.path.join(path, "groups.npy"), mmap_mode="r")
+        self.signers = self.meta.get("signers", [])
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def num_features(self):
+        return self.features.shape[1]
+
+    def rows(self, indices):
+        """
+        :return: (float32 features, int labels) of the given rows, in index order
+        """
+        indices = np.sort(indices)  # sequential reads from the memory map
+        return self.features[indices].astype(np.float32), self.labels[indices].astype(np.int64)
+
+
+def _write_arrays(tmp, rows, fill, dtype):
+    features = np.lib.format.open_memmap(os.path.join(tmp, "features.npy"), mode="w+", dtype=dtype, shape=(rows, 63))
+    label_indices = np.lib.format.open_memmap(os.path.join(tmp, "labels.npy"), mode="w+", dtype=np.int16, shape=(rows,))
+    groups = np.lib.format.open_memmap(os.path.join(tmp, "groups.npy"), mode="w+", dtype=np.int32, shape=(rows,))
+    fill(features, label_indices, groups)
+    for array in (features, label_indices, groups):
+        array.flush()
+    del features, label_indices, groups
+
+
+def _convert_csv(source, tmp, dtype, chunk_rows):
+    import pandas as pd
+
+    # Count rows with a cheap byte scan so the output can be preallocated
+    rows, last = 0, b"\n"
+    with open(source, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            rows += chunk.count(b"\n")
+            last = chunk[-1:]
+    rows += (last != b"\n") - 1  # unterminated last line, header
+    index = {char: i for i, char in labels.items()}
+
+    def fill(features, label_indices, groups):
+        # collect_data.py appended one recording at a time: a run of one
+        # label is one recording, and recordings become the split groups
+        offset, group, previous = 0, -1, None
+        for chunk in pd.read_csv(source, chunksize=chunk_rows, dtype={"label": str}):
+            n = len(chunk)
+            features[offset:offset + n] = chunk.iloc[:, :-1].to_numpy(dtype=np.float32)
+            chunk_labels = np.array([index[char] for char in chunk.iloc[:, -1]], dtype=np.int16)
+            label_indices[offset:offset + n] = chunk_labels
+            changes = np.r_[chunk_labels[0] != previous, chunk_labels[1:] != chunk_labels[:-1]]
+            groups[offset:offset + n] = group + np.cumsum(changes)
+            group = int(groups[offset + n - 1])
+            previous = chunk_labels[-1]
+            offset += n
+        if offset != rows:
+            raise ValueError(f"{source} has blank or multi-line rows ({offset} parsed, {rows} lines)")
+
+    _write_arrays(tmp, rows, fill, dtype)
+    return rows, {}
+
+
+def _convert_shards(source, tmp, dtype):
+    entries = read_manifest(source)
+    rows = sum(entry["rows"] for entry in entries)
+    signers = sorted({entry.get("signer") or "unknown" for entry in entries})
+
+    def fill(features, label_indices, groups):
+        offset = 0
+        for i, entry in enumerate(entries):
+            with np.load(os.path.join(source, entry["shard"])) as shard:
+                n = entry["rows"]
+                features[offset:offset + n] = shard["features"]
+                label_indices[offset:offset + n] = shard["labels"]
+            groups[offset:offset + n] = i
+            offset += n
+
+    _write_arrays(tmp, rows, fill, dtype)
+    shard_signers = [signers.index(entry.get("signer") or "unknown") for entry in entries]
+    shard_sessions = [entry.get("session") for entry in entries]
+    return rows, {"signers": signers, "group_signer": shard_signers, "group_session": shard_sessions}
+
+
+def build_cache(source, cache_root=CACHE_ROOT, dtype="float32", chunk_rows=50000):
+    """
+    Converts a CSV file or a shard directory into memory-mappable .npy files
+    under `cache_root/<content hash>/`, unless that cache already exists.
+
+    Features are stored as float32 (or float16 to halve the size), labels as
+    int16 indices into src/labels.py and groups as int32 recording ids.
+
+    :return: CachedDataset
+    """
+    key = content_hash(source, dtype)
+    path = os.path.join(cache_root, key)
+    if os.path.exists(os.path.join(path, "meta.json")):
+        return CachedDataset(path)
+
+    os.makedirs(cache_root, exist_ok=True)
+    tmp = os.path.join(cache_root, f".{key}-{uuid.uuid4().hex[:6]}.tmp")
+    os.makedirs(tmp)
+    try:
+        if os.path.isdir(source):
+            rows, extra = _convert_shards(source, tmp, dtype)
+        else:
+            rows, extra = _convert_csv(source, tmp, dtype, chunk_rows)
+        meta = dict(extra, source=os.path.abspath(source), rows=rows, dtype=np.dtype(dtype).name,
+                    layout=FEATURE_LAYOUT, format=CACHE_FORMAT)
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, path)
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    print(f"✅ Cached {rows} rows from {source} in {path}")
+    return CachedDataset(path)
+
+
+def default_source():
+    """
+    :return: The shard directory if collect_data.py wrote any, else the legacy CSV
+    """
+    shards = "training/dataset/shards"
+    return shards if read_manifest(shards) else "training/dataset/sign_data.csv"
+
+
+def split_indices(n, test_size=0.2, seed=42, groups=None):
+    """
+    Shuffled train/test split of row indices, shared by train_model.py and
+    quantize_model.py so the held-out rows are the same in both.
+
+    :param groups: Optional group id per row (e.g. dataset.groups); whole
+                   groups are then held out until `test_size` of the rows is
+                   reached, so frames of one recording never land on both sides
+    """
+    rng = np.random.default_rng(seed)
+    if groups is None:
+        order = rng.permutation(n)
+        n_test = int(round(n * test_size))
+        return np.sort(order[n_test:]), np.sort(order[:n_test])
+
+    groups = np.asarray(groups)
+    unique, sizes = np.unique(groups, return_counts=True)
+    order = rng.permutation(len(unique))
+    n_test_groups = int(np.searchsorted(np.cumsum(sizes[order]), n * test_size)) + 1
+    n_test_groups = min(n_test_groups, len(unique) - 1)  # keep at least one group to train on
+    test = np.isin(groups, unique[order[:n_test_groups]])
+    return np.flatnonzero(~test), np.flatnonzero(test)
+
+
+def groups_confounded(groups, label_indices):
+    """
+    True when every group holds one label and every label one group, as in a
+    legacy CSV with one recording per sign: any split by group then validates
+    only on classes the model never trained on.
+    """
+    pairs = np.unique(np.stack([np.asarray(groups, dtype=np.int64), np.asarray(label_indices, dtype=np.int64)]), axis=1)
+    return pairs.shape[1] == len(np.unique(pairs[0])) == len(np.unique(pairs[1]))
+
+
+def batches(dataset, indices, batch_size, shuffle=False, seed=0):
+    """
+    Yields (features, labels) batches read from the memory map in the order
+    given by `seed` when shuffling.
+    """
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(indices) if shuffle else indices
+    for start in range(0, len(order), batch_size):
+        yield dataset.rows(order[start:start + batch_size])
+
+
+def make_tf_dataset(dataset, indices, batch_size=16, shuffle=False, seed=0, transform=None, num_features=None):
+    """
+    Streams batches into tf.data with prefetching; only the rows of the
+    batches in flight are ever in memory.
+
+    :param transform: Optional callable (features, labels) -> (features, labels)
+                      applied to each NumPy batch, e.g. augmentation
+    :param num_features: Feature count after `transform` (defaults to the cached width)
+    """
+    import tensorflow as tf
+
+    # tf.data restarts the generator every epoch, each run gets the next seed
+    seeds = itertools.count(seed)
+
+    def generate():
+        for features, batch_labels in batches(dataset, indices, batch_size, shuffle, next(seeds)):
+            if transform is not None:
+                features, batch_labels = transform(features, batch_labels)
+            yield features, batch_labels
+
+    signature = (
+        tf.TensorSpec([None, num_features or dataset.num_features], tf.float32),
+        tf.TensorSpec([None], tf.int64),
+    )
+    return tf.data.Dataset.from_generator(generate, output_signature=signature).prefetch(tf.data.AUTOTUNE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the dataset into the memory-mapped cache")
+    parser.add_argument("--source", default=None, help="CSV file or shard directory (default: shards, else CSV)")
+    parser.add_argument("--cache-root", default=CACHE_ROOT)
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    args = parser.parse_args()
+
+    dataset = build_cache(args.source or default_source(), args.cache_root, args.dtype)
+    size = sum(os.path.getsize(os.path.join(dataset.path, name)) for name in os.listdir(dataset.path))
+    print(f"{len(dataset)} rows, {len(np.unique(dataset.groups))} recordings, {size / 1024 / 1024:.1f} MiB at {dataset.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from src.labels import labels
+
+MANIFEST = "manifest.jsonl"
+
+# Features are 21 landmarks x (x, y, z), interleaved per landmark exactly as
+# extract_keypoints() produces them at serving time
+FEATURE_LAYOUT = "xyz-interleaved"
+
+
+def _fsync_dir(path):
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(path, os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class ShardWriter:
+    """
+    Append-only dataset writer: every recording becomes its own .npz shard
+    (float32 features, int16 label indices from src/labels.py) and one line in
+    manifest.jsonl.
+
+    Nothing already written is ever rewritten. A shard is written to a
+    temporary file and renamed into place before its manifest line is
+    appended, so an interrupted run loses at most the recording in progress;
+    a shard without a manifest line is simply ignored.
+    """
+
+    def __init__(self, root, signer=None, session=None):
+        """
+        :param root: Dataset directory holding the shards and the manifest
+        :param signer: Who performed the signs, kept for per-signer splits
+        :param session: Collection session id shared by the shards of this writer
+        """
+        self.root = root
+        self.signer = signer
+        self.session = session or time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        os.makedirs(root, exist_ok=True)
+
+    def write(self, features, label_indices, **metadata):
+        """
+        :param features: Array of shape (n, 63)
+        :param label_indices: Label index per row, or a single index for the whole recording
+        :param metadata: Extra JSON-serialisable fields stored in the manifest entry
+        :return: Manifest entry of the new shard, None if there were no rows
+        """
+        features = np.asarray(features, dtype=np.float32).reshape(-1, 63)
+        if not len(features):
+            return None
+        label_indices = np.broadcast_to(np.asarray(label_indices, dtype=np.int16), (len(features),))
+
+        name = f"shard-{self.session}-{uuid.uuid4().hex[:8]}.npz"
+        path = os.path.join(self.root, name)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, features=features, labels=label_indices)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        _fsync_dir(self.root)
+
+        values, counts = np.unique(label_indices, return_counts=True)
+        entry = dict(
+            metadata,
+            shard=name,
+            rows=len(features),
+            labels={labels[int(v)]: int(c) for v, c in zip(values, counts)},
+            session=metadata.get("session", self.session),
+            signer=metadata.get("signer", self.signer),
+            layout=FEATURE_LAYOUT,
+            created=time.time(),
+        )
+        manifest_path = os.path.join(self.root, MANIFEST)
+        line = json.dumps(entry) + "\n"
+        if os.path.exists(manifest_path) and os.path.getsize(manifest_path):
+            with open(manifest_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = "\n" + line  # keep a line cut short by a crash separate
+        with open(manifest_path, "a", encoding="utf8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        return entry
+
+
+def read_manifest(root):
+    """
+    :return: Manifest entries in write order; a line cut short by an
+             interrupted write is skipped
+    """
+    path = os.path.join(root, MANIFEST)
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, encoding="utf8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"⚠️ Skipping incomplete manifest line in {path}")
+    return entries
+
+
+def load_shards(root, entries=None):
+    """
+    :param entries: Manifest entries to load (defaults to all)
+    :return: (features float32 (n, 63), label indices int16 (n,), shard number per row)
+    """
+    entries = read_manifest(root) if entries is None else entries
+    features, label_indices, shard_ids = [], [], []
+    for i, entry in enumerate(entries):
+        with np.load(os.path.join(root, entry["shard"])) as shard:
+            features.append(shard["features"])
+            label_indices.append(shard["labels"])
+        shard_ids.append(np.full(entry["rows"], i, dtype=np.int32))
+    if not features:
+        return np.empty((0, 63), np.float32), np.empty(0, np.int16), np.empty(0, np.int32)
+    return np.concatenate(features), np.concatenate(label_indices), np.concatenate(shard_ids)
+
+
+def import_csv(csv_path, root, signer=None):
+    """
+    Converts a legacy sign_data.csv into shards. collect_data.py appended one
+    recording at a time, so each contiguous run of one label becomes a shard.
+
+    :return: Number of shards written
+    """
+    import pandas as pd
+
+    df = pd.read_csv(csv_path)
+    index = {char: i for i, char in labels.items()}
+    features = df.iloc[:, :-1].values.astype(np.float32)
+    label_indices = np.array([index[str(char)] for char in df.iloc[:, -1]], dtype=np.int16)
+
+    writer = ShardWriter(root, signer=signer, session="csv-" + uuid.uuid4().hex[:6])
+    boundaries = np.flatnonzero(np.diff(label_indices)) + 1
+    written = 0
+    for run, (start, end) in enumerate(zip(np.r_[0, boundaries], np.r_[boundaries, len(df)])):
+        writer.write(features[start:end], label_indices[start],
+                     source=os.path.basename(csv_path), source_rows=[int(start), int(end)], recording=run)
+        written += 1
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the sharded training dataset")
+    parser.add_argument("--root", default="training/dataset/shards")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="Import a legacy CSV dataset")
+    import_parser.add_argument("csv", nargs="?", default="training/dataset/sign_data.csv")
+    import_parser.add_argument("--signer")
+    commands.add_parser("summary", help="Print rows per label and signer")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        count = import_csv(args.csv, args.root, signer=args.signer)
+        print(f"✅ Imported {args.csv} as {count} shards into {args.root}")
+    else:
+        entries = read_manifest(args.root)
+        per_label, per_signer = {}, {}
+        for entry in entries:
+            for char, count in entry["labels"].items():
+                per_label[char] = per_label.get(char, 0) + count
+            signer = entry.get("signer") or "unknown"
+            per_signer[signer] = per_signer.get(signer, 0) + entry["rows"]
+        print(f"{len(entries)} shards, {sum(e['rows'] for e in entries)} rows")
+        print("Per label:", dict(sorted(per_label.items())))
+        print("Per signer:", per_signer)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Exports the trained Keras model next to its .h5 file as a TensorFlow Lite
+flatbuffer and, optionally, an ONNX graph.
+
+Usage:
+    python training/export_model.py [--model models/sign_language_model.h5] [--onnx]
+"""
+import argparse
+import os
+import tensorflow as tf
+from tensorflow.keras.models import load_model
+
+NUM_FEATURES = 63
+
+
+def export_tflite(model, output_path, calibration_data=None):
+    """
+    Converts a Keras model to a TFLite flatbuffer with a dynamic batch dimension.
+
+    :param model: Loaded Keras model
+    :param output_path: Destination .tflite file
+    :param calibration_data: Optional (n, 63) float array; when given the model is
+                             fully quantized to int8 (weights, activations, input and output)
+    :return: Size of the written file in bytes
+    """
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if calibration_data is not None:
+        def representative_dataset():
+            for row in calibration_data:
+                yield [row[None, :].astype("float32")]
+
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+    tflite_model = converter.convert()
+    with open(output_path, "wb") as f:
+        f.write(tflite_model)
+    return len(tflite_model)
+
+
+def export_onnx(model, output_path):
+    """
+    Converts a Keras model to ONNX (requires the tf2onnx package).
+
+    :param model: Loaded Keras model
+    :param output_path: Destination .onnx file
+    :return: Size of the written file in bytes
+    """
+    import tf2onnx
+
+    spec = (tf.TensorSpec((None, NUM_FEATURES), tf.float32, name="keypoints"),)
+    tf2onnx.convert.from_keras(model, input_signature=spec, output_path=output_path)
+    return os.path.getsize(output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the sign classifier for lightweight runtimes.")
+    parser.add_argument("--model", default="models/sign_language_model.h5", help="Trained Keras .h5 model")
+    parser.add_argument("--onnx", action="store_true", help="Also export an ONNX graph (needs tf2onnx)")
+    args = parser.parse_args()
+
+    model = load_model(args.model)
+    root = os.path.splitext(args.model)[0]
+
+    size = export_tflite(model, root + ".tflite")
+    print(f"TFLite model saved as '{root}.tflite' ({size / 1024:.1f} KB)")
+
+    if args.onnx:
+        size = export_onnx(model, root + ".onnx")
+        print(f"ONNX model saved as '{root}.onnx' ({size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
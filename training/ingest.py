@@ -0,0 +1,292 @@
+"""
+Offline landmark extraction from existing videos and image folders.
+
+Walks a directory tree, labels every file by its nearest folder named after a
+label (e.g. clips/A/take1.mp4) or by a sidecar file next to it (take1.txt
+holding the label, or take1.json with "label" and optional "signer",
+"session", "start"/"end" seconds and "mirrored"). Files are processed in a
+pool of worker processes, each keeping its own MediaPipe Hands instances, and
+every video (or folder of images of one label) is appended as one shard.
+
+The run can be interrupted at any time: sources already in the manifest, or
+logged as containing no hands, are skipped when it is started again.
+
+Usage:
+    python training/ingest.py /data/clips --signer alice
+    python training/ingest.py /data/photos --workers 8 --max-hands 1
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from src.labels import labels
+from dataset_shards import ShardWriter, read_manifest
+
+VIDEO_EXTENSIONS = {".mp4", ".mov", ".avi", ".mkv", ".webm", ".m4v"}
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+# Sources that produced no rows; they have no shard, so they are logged here
+# to be skipped on resume
+EMPTY_LOG = "ingest-empty.jsonl"
+
+label_index = {char: i for i, char in labels.items()}
+
+# Per-process MediaPipe state, see _init_worker()
+_hands = {}
+_max_hands = 1
+
+
+def _parse_label(name):
+    return label_index.get(str(name).strip().upper())
+
+
+def read_sidecar(path):
+    """
+    :return: Sidecar fields of a media file ({"label": "A", ...}), empty if it has none
+    """
+    stem = os.path.splitext(path)[0]
+    if os.path.exists(stem + ".json"):
+        with open(stem + ".json", encoding="utf8") as f:
+            sidecar = json.load(f)
+        return sidecar if isinstance(sidecar, dict) else {"label": sidecar}
+    if os.path.exists(stem + ".txt"):
+        with open(stem + ".txt", encoding="utf8") as f:
+            return {"label": f.read().strip()}
+    return {}
+
+
+def folder_label(path, root):
+    """
+    :return: Label index of the nearest parent folder (below `root`) named after a label, or None
+    """
+    directory = os.path.dirname(path)
+    while os.path.normpath(directory) != os.path.normpath(root) and directory:
+        index = _parse_label(os.path.basename(directory))
+        if index is not None:
+            return index
+        directory = os.path.dirname(directory)
+    return None
+
+
+def find_tasks(root):
+    """
+    Resolves the label of every media file under `root`.
+
+    :return: (tasks, unlabeled paths); a task is one video, or all images of
+             one label in one folder
+    """
+    tasks, unlabeled, image_groups = [], [], {}
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories.sort()
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            extension = os.path.splitext(name)[1].lower()
+            if extension not in VIDEO_EXTENSIONS and extension not in IMAGE_EXTENSIONS:
+                continue
+            sidecar = read_sidecar(path)
+            index = _parse_label(sidecar["label"]) if "label" in sidecar else folder_label(path, root)
+            if index is None:
+                unlabeled.append(path)
+                continue
+            extra = {k: sidecar[k] for k in ("signer", "session") if k in sidecar}
+            if extension in VIDEO_EXTENSIONS:
+                tasks.append(dict(
+                    kind="video", source=os.path.realpath(path), files=[path], label=index, extra=extra,
+                    start=sidecar.get("start"), end=sidecar.get("end"), mirrored=bool(sidecar.get("mirrored")),
+                ))
+            else:
+                key = (directory, index, bool(sidecar.get("mirrored")), json.dumps(extra, sort_keys=True))
+                image_groups.setdefault(key, []).append(path)
+
+    for (directory, index, mirrored, extra), paths in image_groups.items():
+        source = os.path.join(os.path.realpath(directory), f"*[{labels[index]}]")
+        tasks.append(dict(kind="images", source=source, files=paths, label=index, extra=json.loads(extra),
+                          start=None, end=None, mirrored=mirrored))
+    for task in tasks:
+        task["fingerprint"] = f"{len(task['files'])}:{sum(os.path.getsize(p) for p in task['files'])}"
+    return tasks, unlabeled
+
+
+def _init_worker(max_hands):
+    global _max_hands
+    _max_hands = max_hands
+    import cv2
+    cv2.setNumThreads(1)  # parallelism comes from the worker processes
+    os.environ.setdefault("GLOG_minloglevel", "2")
+
+
+def _get_hands(static):
+    """
+    One Hands instance per worker and mode, reused for every file: tracking
+    for videos, detection on every frame for unrelated still images.
+    """
+    if static not in _hands:
+        import mediapipe as mp
+        _hands[static] = mp.solutions.hands.Hands(
+            static_image_mode=static, max_num_hands=_max_hands,
+            min_detection_confidence=0.7, min_tracking_confidence=0.7,
+        )
+    return _hands[static]
+
+
+def _landmarks(hands, frame, flip):
+    import cv2
+
+    if flip:
+        frame = cv2.flip(frame, 1)  # match the mirrored webcam frames of collect_data.py and the app
+    results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    rows = []
+    for hand_landmarks in results.multi_hand_landmarks or []:
+        rows.append([value for landmark in hand_landmarks.landmark
+                     for value in (landmark.x, landmark.y, landmark.z)])
+    return rows
+
+
+def extract(task, stride=1, max_frames=0, flip=True):
+    """
+    Runs MediaPipe Hands over one task's frames.
+
+    :return: (task, float32 keypoints (n, 63), frames read, error message or None)
+    """
+    import cv2
+
+    flip = flip and not task["mirrored"]
+    rows, frames = [], 0
+    try:
+        if task["kind"] == "images":
+            hands = _get_hands(static=True)
+            for path in task["files"]:
+                frame = cv2.imread(path)
+                if frame is None:
+                    continue
+                frames += 1
+                rows.extend(_landmarks(hands, frame, flip))
+        else:
+            hands = _get_hands(static=False)
+            hands.reset()  # no tracking state carried over from the previous video
+            capture = cv2.VideoCapture(task["files"][0])
+            if not capture.isOpened():
+                return task, None, 0, "cannot open video"
+            try:
+                if task["start"]:
+                    capture.set(cv2.CAP_PROP_POS_MSEC, float(task["start"]) * 1000.0)
+                position = 0
+                while not max_frames or frames < max_frames:
+                    ok, frame = capture.read()
+                    if not ok:
+                        break
+                    if task["end"] is not None and capture.get(cv2.CAP_PROP_POS_MSEC) > float(task["end"]) * 1000.0:
+                        break
+                    position += 1
+                    if (position - 1) % stride:
+                        continue
+                    frames += 1
+                    rows.extend(_landmarks(hands, frame, flip))
+            finally:
+                capture.release()
+    except Exception as e:
+        return task, None, frames, str(e)
+    return task, np.asarray(rows, dtype=np.float32).reshape(-1, 63), frames, None
+
+
+def completed_sources(root):
+    """
+    :return: {source: fingerprint} of everything already ingested into `root`
+    """
+    done = {entry["source"]: entry.get("source_fingerprint") for entry in read_manifest(root)
+            if "source_fingerprint" in entry}
+    path = os.path.join(root, EMPTY_LOG)
+    if os.path.exists(path):
+        with open(path, encoding="utf8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # cut short by an interrupted run, the source is retried
+                done[entry["source"]] = entry["source_fingerprint"]
+    return done
+
+
+def log_empty(root, task, frames):
+    with open(os.path.join(root, EMPTY_LOG), "a", encoding="utf8") as f:
+        f.write(json.dumps({"source": task["source"], "source_fingerprint": task["fingerprint"],
+                            "frames": frames, "created": time.time()}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract hand landmarks from video files and image folders")
+    parser.add_argument("inputs", nargs="+", help="Directories to walk")
+    parser.add_argument("--root", default="training/dataset/shards", help="Shard directory to append to")
+    parser.add_argument("--signer", default=None, help="Signer of files without a sidecar 'signer'")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--stride", type=int, default=1, help="Use every n-th video frame")
+    parser.add_argument("--max-frames", type=int, default=0, help="Frames used per video (0 = all)")
+    parser.add_argument("--max-hands", type=int, default=1, help="Hands detected per frame")
+    parser.add_argument("--no-flip", action="store_true", help="Files are already mirrored like the webcam view")
+    parser.add_argument("--dry-run", action="store_true", help="Only list what would be ingested")
+    args = parser.parse_args()
+
+    tasks, unlabeled = [], []
+    for directory in args.inputs:
+        found, missing = find_tasks(directory)
+        tasks.extend(found)
+        unlabeled.extend(missing)
+    for path in unlabeled[:10]:
+        print(f"⚠️ No label for {path}")
+    if len(unlabeled) > 10:
+        print(f"⚠️ ... and {len(unlabeled) - 10} more unlabeled files")
+
+    done = completed_sources(args.root)
+    pending = []
+    for task in tasks:
+        if task["source"] not in done:
+            pending.append(task)
+        elif done[task["source"]] != task["fingerprint"]:
+            print(f"⚠️ {task['source']} changed since it was ingested, skipping it")
+    print(f"✅ {len(tasks)} sources found, {len(tasks) - len(pending)} already ingested, {len(pending)} to go")
+    if args.dry_run or not pending:
+        return
+
+    writer = ShardWriter(args.root, signer=args.signer)
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    workers = min(args.workers or cpus, len(pending))
+
+    import multiprocessing
+    context = multiprocessing.get_context("spawn")
+    rows_written, failed = 0, 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                             initargs=(args.max_hands,)) as pool:
+        futures = [pool.submit(extract, task, args.stride, args.max_frames, not args.no_flip) for task in pending]
+        for count, future in enumerate(as_completed(futures), 1):
+            task, features, frames, error = future.result()
+            name = os.path.relpath(task["files"][0]) if task["kind"] == "video" else task["source"]
+            if error:
+                failed += 1
+                print(f"⚠️ [{count}/{len(pending)}] {name}: {error}")
+                continue
+            # Written from this process only, so manifest appends never interleave
+            entry = writer.write(features, task["label"], source=task["source"], source_fingerprint=task["fingerprint"],
+                                 kind=task["kind"], frames=frames, **task["extra"])
+            if entry is None:
+                log_empty(args.root, task, frames)
+                print(f"⚠️ [{count}/{len(pending)}] {name}: no hands in {frames} frames")
+                continue
+            rows_written += entry["rows"]
+            print(f"✅ [{count}/{len(pending)}] {name}: '{labels[task['label']]}', {entry['rows']} rows from {frames} frames")
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Wrote {rows_written} rows to {args.root} in {elapsed:.0f}s on {workers} workers"
+          + (f", {failed} sources failed and will be retried on the next run" if failed else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Post-training INT8 quantization of the sign classifier.
+
+Calibrates a fully integer TFLite model on a sample of the training split and
+writes a report comparing it with the float32 TFLite model on the held-out
+split: overall and per-class accuracy, p50/p99 single-frame latency and
+model size.
+
+Usage:
+    python training/quantize_model.py [--model models/sign_language_model.h5]
+                                      [--dataset training/dataset/shards]
+                                      [--calibration-samples 500]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+from tensorflow.keras.models import load_model
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from src.labels import labels
+from src.model import TFLiteBackend, resolve_model_path  # Import from src
+from export_model import export_tflite
+from dataset_cache import build_cache, default_source, split_indices
+
+
+def measure_latency(backend, X, runs=1000):
+    """
+    Times single-frame predict_batch calls, the shape served per hand.
+
+    :return: (p50, p99) latency in milliseconds
+    """
+    timings = np.empty(runs)
+    for i in range(runs):
+        row = X[i % len(X)][None, :]
+        start = time.perf_counter()
+        backend.predict_batch(row)
+        timings[i] = (time.perf_counter() - start) * 1000.0
+    return float(np.percentile(timings, 50)), float(np.percentile(timings, 99))
+
+
+def evaluate(backend, model_path, X, y, class_names):
+    predictions = backend.predict_batch(X).argmax(axis=1)
+    per_class = {
+        str(name): float(np.mean(predictions[y == i] == i))
+        for i, name in enumerate(class_names)
+        if np.any(y == i)
+    }
+    p50, p99 = measure_latency(backend, X)
+    return {
+        "accuracy": float(np.mean(predictions == y)),
+        "per_class_accuracy": per_class,
+        "latency_p50_ms": p50,
+        "latency_p99_ms": p99,
+        "size_bytes": os.path.getsize(model_path),
+    }, predictions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantize the sign classifier to INT8 and report the trade-off.")
+    parser.add_argument("--model", default="models/sign_language_model.h5", help="Trained Keras .h5 model")
+    parser.add_argument("--dataset", default=None, help="Dataset used for training (default: shards, else sign_data.csv)")
+    parser.add_argument("--calibration-samples", type=int, default=500, help="Training rows used for calibration")
+    parser.add_argument("--report", default=None, help="Report path (default: <model>_quantization.json)")
+    args = parser.parse_args()
+
+    # Same split as train_model.py so the held-out rows were never trained on
+    dataset = build_cache(args.dataset or default_source())
+    train_idx, test_idx = split_indices(len(dataset), test_size=0.2, seed=42)
+    X_test, y_test = dataset.rows(test_idx)
+    class_names = [labels[i] for i in range(len(labels))]
+
+    rng = np.random.default_rng(0)
+    calibration, _ = dataset.rows(rng.choice(train_idx, min(args.calibration_samples, len(train_idx)), replace=False))
+
+    model = load_model(args.model)
+    float_path = resolve_model_path(args.model, "tflite")
+    int8_path = resolve_model_path(args.model, "tflite_int8")
+    export_tflite(model, float_path)
+    export_tflite(model, int8_path, calibration_data=calibration)
+    print(f"INT8 model saved as '{int8_path}'")
+
+    float32, float_predictions = evaluate(TFLiteBackend(float_path), float_path, X_test, y_test, class_names)
+    int8, int8_predictions = evaluate(TFLiteBackend(int8_path), int8_path, X_test, y_test, class_names)
+    report = {
+        "held_out_samples": int(len(X_test)),
+        "calibration_samples": int(len(calibration)),
+        "float32": float32,
+        "int8": int8,
+        "prediction_agreement": float(np.mean(float_predictions == int8_predictions)),
+    }
+
+    report_path = args.report or os.path.splitext(args.model)[0] + "_quantization.json"
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'':12}{'float32':>12}{'int8':>12}")
+    print(f"{'accuracy':12}{float32['accuracy']:>12.4f}{int8['accuracy']:>12.4f}")
+    print(f"{'p50 ms':12}{float32['latency_p50_ms']:>12.4f}{int8['latency_p50_ms']:>12.4f}")
+    print(f"{'p99 ms':12}{float32['latency_p99_ms']:>12.4f}{int8['latency_p99_ms']:>12.4f}")
+    print(f"{'size KB':12}{float32['size_bytes'] / 1024:>12.1f}{int8['size_bytes'] / 1024:>12.1f}")
+    worst = sorted(int8["per_class_accuracy"].items(), key=lambda kv: kv[1] - float32["per_class_accuracy"][kv[0]])[:5]
+    print("Largest per-class drops: " + ", ".join(
+        f"{name} {float32['per_class_accuracy'][name]:.2f}->{acc:.2f}" for name, acc in worst))
+    print(f"Report saved as '{report_path}'")
+
+
+if __name__ == "__main__":
+    main()
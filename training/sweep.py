@@ -0,0 +1,246 @@
+"""
+Parallel hyperparameter sweep for the sign classifier.
+
+Trials run in a pool of spawned processes, each pinned to its own cores with
+TensorFlow limited to that many threads, so trials do not fight over the CPU
+and the measured latencies stay comparable. All trials read the same
+memory-mapped dataset cache; the OS shares its pages between processes.
+
+Validation holds out whole recordings, so near-identical frames of one
+recording never score a trial on what it trained on. Only when recordings
+are confounded with labels (one recording per sign, as in a legacy CSV) does
+it fall back to a random frame split, with a warning.
+
+Every trial model is saved with the full 63-feature input (dropped features
+get zero weights), so any of them can be served as is. The leaderboard ranks
+validation accuracy next to single-frame latency on the NumPy serving backend.
+
+Usage:
+    python training/sweep.py --widths 128,64,64 256,128 64,64 --dropout 0.2 0.3 \\
+                             --batch-size 16 32 --learning-rate 0.001 0.0003 \\
+                             --features xyz xy --latency-budget-ms 0.2
+"""
+import argparse
+import itertools
+import json
+import os
+import queue
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from dataset_cache import CachedDataset, build_cache, default_source, groups_confounded, split_indices
+
+# Column subsets of the interleaved x, y, z keypoint vector
+FEATURE_SETS = {
+    "xyz": list(range(63)),
+    "xy": [i for i in range(63) if i % 3 != 2],  # MediaPipe's z is the noisiest coordinate
+}
+
+
+def _init_worker(core_sets, threads):
+    """
+    Pins the worker to one set of cores and caps TensorFlow's thread pools
+    before TensorFlow is first imported in this process.
+    """
+    try:
+        cores = core_sets.get_nowait()
+    except queue.Empty:
+        cores = None  # replacement worker, its cores are still taken
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    for name in ("OMP_NUM_THREADS", "TF_NUM_INTRAOP_THREADS"):
+        os.environ[name] = str(threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _full_input_model(model, params, columns, num_classes):
+    """
+    Rebuilds a trial model with all 63 inputs, zero weights for unused features.
+    """
+    from train_model import build_model
+
+    full = build_model(63, num_classes, params["widths"], params["dropout"], params["learning_rate"])
+    weights = model.get_weights()
+    kernel = np.zeros((63, weights[0].shape[1]), dtype=np.float32)
+    kernel[columns] = weights[0]
+    full.set_weights([kernel] + weights[1:])
+    return full
+
+
+def run_trial(trial_id, params, cache_path, output_dir, epochs, augment, group_split=True):
+    """
+    Trains one configuration and measures its accuracy and serving latency.
+
+    :return: Result dict for the leaderboard
+    """
+    import tensorflow as tf
+    from augment import Augmenter
+    from dataset_cache import make_tf_dataset
+    from quantize_model import measure_latency
+    from train_model import build_model
+    from src.labels import labels
+    from src.model import NumpyBackend
+
+    tf.keras.utils.set_random_seed(trial_id)
+    dataset = CachedDataset(cache_path)
+    groups = dataset.groups if group_split else None
+    train_idx, test_idx = split_indices(len(dataset), test_size=0.2, seed=42, groups=groups)
+    columns = FEATURE_SETS[params["features"]]
+    augmenter = Augmenter(seed=trial_id) if augment else None
+
+    def select(features, batch_labels):
+        if augmenter is not None:
+            features = augmenter.augment(features)
+        return features[:, columns], batch_labels
+
+    train_data = make_tf_dataset(dataset, train_idx, params["batch_size"], shuffle=True, seed=trial_id,
+                                 transform=select, num_features=len(columns))
+    test_data = make_tf_dataset(dataset, test_idx, 256, transform=lambda f, l: (f[:, columns], l),
+                                num_features=len(columns))
+
+    model = build_model(len(columns), len(labels), params["widths"], params["dropout"], params["learning_rate"])
+    start = time.perf_counter()
+    history = model.fit(train_data, validation_data=test_data, epochs=epochs, verbose=0)
+    train_seconds = time.perf_counter() - start
+
+    model_path = os.path.join(output_dir, f"trial_{trial_id:03d}.h5")
+    _full_input_model(model, params, columns, len(labels)).save(model_path)
+
+    X_sample, _ = dataset.rows(test_idx[:1000])
+    p50, p99 = measure_latency(NumpyBackend(model_path), X_sample)
+    return {
+        "trial": trial_id,
+        "params": params,
+        "val_accuracy": float(history.history["val_accuracy"][-1]),
+        "best_val_accuracy": float(max(history.history["val_accuracy"])),
+        "latency_p50_ms": p50,
+        "latency_p99_ms": p99,
+        "parameters": int(model.count_params()),
+        "train_seconds": round(train_seconds, 1),
+        "model": model_path,
+    }
+
+
+def search_space(args):
+    if args.space:
+        with open(args.space) as f:
+            space = json.load(f)
+    else:
+        space = {
+            "widths": [[int(w) for w in widths.split(",")] for widths in args.widths],
+            "dropout": args.dropout,
+            "batch_size": args.batch_size,
+            "learning_rate": args.learning_rate,
+            "features": args.features,
+        }
+    for name in space["features"]:
+        if name not in FEATURE_SETS:
+            raise ValueError(f"Unknown feature set '{name}', expected one of {sorted(FEATURE_SETS)}")
+    keys = sorted(space)
+    grid = [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+    if args.trials and args.trials < len(grid):
+        grid = random.Random(args.seed).sample(grid, args.trials)
+    return grid
+
+
+def core_sets(workers, threads):
+    available = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+    if len(available) < workers * threads:
+        return [None] * workers  # not enough cores to pin, let the OS schedule
+    return [set(available[i * threads:(i + 1) * threads]) for i in range(workers)]
+
+
+def print_leaderboard(results, budget_ms):
+    print(f"\n{'trial':>5} {'val acc':>8} {'p50 ms':>8} {'p99 ms':>8} {'params':>8}  config")
+    for r in results:
+        p = r["params"]
+        marker = "" if budget_ms is None or r["latency_p99_ms"] <= budget_ms else "  (over budget)"
+        print(f"{r['trial']:>5} {r['val_accuracy']:>8.4f} {r['latency_p50_ms']:>8.4f} {r['latency_p99_ms']:>8.4f} "
+              f"{r['parameters']:>8}  widths={p['widths']} dropout={p['dropout']} batch={p['batch_size']} "
+              f"lr={p['learning_rate']} features={p['features']}{marker}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel hyperparameter sweep for the sign classifier")
+    parser.add_argument("--data", default=None, help="Shard directory or CSV (default: shards, else sign_data.csv)")
+    parser.add_argument("--space", default=None, help="JSON search space, overrides the list options below")
+    parser.add_argument("--widths", nargs="+", default=["128,64,64"], help="Hidden layer widths, e.g. 128,64,64")
+    parser.add_argument("--dropout", nargs="+", type=float, default=[0.3])
+    parser.add_argument("--batch-size", nargs="+", type=int, default=[16])
+    parser.add_argument("--learning-rate", nargs="+", type=float, default=[0.001])
+    parser.add_argument("--features", nargs="+", default=["xyz"], help=f"Feature sets: {', '.join(FEATURE_SETS)}")
+    parser.add_argument("--trials", type=int, default=0, help="Random sample of the grid (0 = full grid)")
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--no-augment", action="store_true")
+    parser.add_argument("--threads", type=int, default=1, help="Cores (and TF threads) per trial")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel trials (default: cores // threads)")
+    parser.add_argument("--latency-budget-ms", type=float, default=None, help="p99 budget for the recommendation")
+    parser.add_argument("--output", default="models/sweep")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    grid = search_space(args)
+    dataset = build_cache(args.data or default_source())
+    os.makedirs(args.output, exist_ok=True)
+    group_split = not groups_confounded(dataset.groups, dataset.labels)
+    if not group_split:
+        print("⚠️ Each recording holds one sign and each sign one recording, so holding out recordings would "
+              "validate on unseen signs. Falling back to a random frame split, which leaks near-identical "
+              "frames into validation; rankings are optimistic.")
+
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    workers = args.workers or max(1, cpus // args.threads)
+    workers = min(workers, len(grid))
+    print(f"✅ {len(grid)} trials on {workers} workers x {args.threads} threads, dataset {dataset.path}")
+
+    import multiprocessing
+    context = multiprocessing.get_context("spawn")  # fresh processes, no inherited TF state
+    cores = context.Queue()
+    for core_set in core_sets(workers, args.threads):
+        cores.put(core_set)
+
+    results = []
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                             initargs=(cores, args.threads)) as pool:
+        futures = {
+            pool.submit(run_trial, i, params, dataset.path, args.output, args.epochs, not args.no_augment,
+                        group_split): i
+            for i, params in enumerate(grid)
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"⚠️ Trial {futures[future]} failed: {e}")
+                continue
+            results.append(result)
+            print(f"✅ Trial {result['trial']}: val acc {result['val_accuracy']:.4f}, "
+                  f"p99 {result['latency_p99_ms']:.4f} ms ({len(results)}/{len(grid)})")
+
+    results.sort(key=lambda r: (-r["val_accuracy"], r["latency_p99_ms"]))
+    leaderboard_path = os.path.join(args.output, "leaderboard.json")
+    with open(leaderboard_path, "w") as f:
+        json.dump({"latency_budget_ms": args.latency_budget_ms, "split": "recording" if group_split else "frame",
+                   "results": results}, f, indent=2)
+    print_leaderboard(results, args.latency_budget_ms)
+
+    eligible = [r for r in results if args.latency_budget_ms is None or r["latency_p99_ms"] <= args.latency_budget_ms]
+    if eligible:
+        print(f"\nBest within budget: trial {eligible[0]['trial']} -> {eligible[0]['model']}")
+    else:
+        print("\n⚠️ No trial meets the latency budget")
+    print(f"Leaderboard saved as '{leaderboard_path}'")
+
+
+if __name__ == "__main__":
+    main()
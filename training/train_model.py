@@ -1,44 +1,72 @@
-
-import numpy as np
-import pandas as pd
+import argparse
+import os
+import sys
 import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Dense, Dropout
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
-
-# Load dataset
-dataset_path = "training/dataset/sign_data.csv"
-df = pd.read_csv(dataset_path)
-
-# Separate features (X) and labels (y)
-X = df.iloc[:, :-1].values  # All columns except the last (keypoints)
-y = df.iloc[:, -1].values   # Last column (labels)
-
-# Encode labels into numbers
-label_encoder = LabelEncoder()
-y_encoded = label_encoder.fit_transform(y)
-
-# Split data into training & testing sets
-X_train, X_test, y_train, y_test = train_test_split(X, y_encoded, test_size=0.2, random_state=42)
-
-# Define Neural Network Model
-model = Sequential([
-    Dense(128, activation='relu', input_shape=(X_train.shape[1],)),
-    Dropout(0.3),
-    Dense(64, activation='relu'),
-    Dropout(0.3),
-    Dense(64, activation='relu'),
-    Dropout(0.3),
-    Dense(len(np.unique(y_encoded)), activation='softmax')  # Output layer (one neuron per class)
-])
-
-# Compile model
-model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
-
-# Train model
-model.fit(X_train, y_train, validation_data=(X_test, y_test), epochs=50, batch_size=16)
-
-# Save trained model
-model.save("models/sign_language_model.h5")
-print("Model training complete. Saved as 'models/sign_language_model.h5'")
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from src.labels import labels
+from augment import Augmenter
+from dataset_cache import build_cache, default_source, make_tf_dataset, split_indices
+
+
+def build_model(num_features, num_classes, widths=(128, 64, 64), dropout=0.3, learning_rate=0.001):
+    """
+    Define Neural Network Model: ReLU Dense layers of the given widths, each
+    followed by dropout (the defaults are the original architecture).
+    """
+    layers = []
+    for i, width in enumerate(widths):
+        kwargs = {'input_shape': (num_features,)} if i == 0 else {}
+        layers += [Dense(width, activation='relu', **kwargs), Dropout(dropout)]
+    layers.append(Dense(num_classes, activation='softmax'))  # Output layer (one neuron per class)
+    model = Sequential(layers)
+
+    # Compile model
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate), loss='sparse_categorical_crossentropy',
+                  metrics=['accuracy'])
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the sign classifier")
+    parser.add_argument("--data", default=None, help="Shard directory or CSV (default: shards, else sign_data.csv)")
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32", help="Cached feature precision")
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--output", default="models/sign_language_model.h5")
+    parser.add_argument("--no-augment", action="store_true", help="Train on the recorded keypoints only")
+    args = parser.parse_args()
+
+    # Load dataset through the memory-mapped cache (converted once per content hash)
+    dataset = build_cache(args.data or default_source(), dtype=args.dtype)
+
+    # Split data into training & testing sets
+    train_idx, test_idx = split_indices(len(dataset), test_size=0.2, seed=42)
+
+    # Stream batches from disk instead of materialising the whole table;
+    # outputs are indexed like src/labels.py, which the server decodes with.
+    # Training batches are augmented on the fly, validation stays as recorded.
+    augmenter = None if args.no_augment else Augmenter(seed=42)
+    train_data = make_tf_dataset(dataset, train_idx, args.batch_size, shuffle=True, transform=augmenter)
+    test_data = make_tf_dataset(dataset, test_idx, args.batch_size)
+
+    model = build_model(dataset.num_features, len(labels))
+
+    # Train model
+    model.fit(train_data, validation_data=test_data, epochs=args.epochs)
+
+    # Save trained model
+    model.save(args.output)
+    print(f"Model training complete. Saved as '{args.output}'")
+
+    # Export a TFLite flatbuffer next to the h5 for fast cold start on CPU-only hosts
+    from export_model import export_tflite
+    tflite_path = args.output.rsplit(".", 1)[0] + ".tflite"
+    export_tflite(model, tflite_path)
+    print(f"TFLite export saved as '{tflite_path}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from src.labels import labels
+from dataset_cache import build_cache, default_source, groups_confounded
+
+
+def build_windows(X, y, runs, window, stride):
+    """
+    Cuts every run into overlapping windows of `window` consecutive frames.
+    Windows never cross a run boundary or a label change.
+
+    :return: (windows of shape (n, window, 63), labels, run id per window)
+    """
+    windows, window_labels, window_runs = [], [], []
+    boundaries = np.flatnonzero((np.diff(runs) != 0) | (np.diff(y) != 0)) + 1
+    for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(runs)]):
+        if end - start < window:
+            continue
+        view = np.lib.stride_tricks.sliding_window_view(X[start:end], window, axis=0)[::stride]
+        windows.append(view.transpose(0, 2, 1))
+        window_labels.append(np.full(len(view), y[start]))
+        window_runs.append(np.full(len(view), runs[start]))
+    if not windows:
+        raise ValueError(f"No recording has {window} frames, lower --window")
+    return (np.concatenate(windows).astype(np.float32),
+            np.concatenate(window_labels), np.concatenate(window_runs))
+
+
+def build_model(window, features, num_classes, kernel_size=5, filters=64):
+    """
+    Conv1D + global average pooling + Dense head. With 'valid' padding every
+    convolution output depends on `kernel_size` consecutive frames only, which
+    is what lets src/sequence.py run the model one frame at a time.
+    """
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Input, Conv1D, GlobalAveragePooling1D, Dense, Dropout
+
+    model = Sequential([
+        Input(shape=(window, features)),
+        Conv1D(filters, kernel_size, activation='relu'),
+        GlobalAveragePooling1D(),
+        Dense(64, activation='relu'),
+        Dropout(0.3),
+        Dense(num_classes, activation='softmax')
+    ])
+    model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+    return model
+
+
+def check_streaming(model_path, windows, model):
+    """
+    Replays windows frame by frame through the streaming runner and compares
+    the final output with the full-window Keras prediction.
+    """
+    from src.sequence import SequenceModel
+
+    runner = SequenceModel(model_path)
+    expected = model.predict(windows, verbose=0)
+    max_diff = 0.0
+    for sequence, reference in zip(windows, expected):
+        stream = runner.new_stream()
+        for frame in sequence:
+            output = runner.step(stream, frame)
+        max_diff = max(max_diff, float(np.abs(output - reference).max()))
+    return max_diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the streaming sequence model for motion signs (J, Z)")
+    parser.add_argument("--data", default=None,
+                        help="Shard directory (one recording per shard) or legacy CSV (default: shards, else CSV)")
+    parser.add_argument("--output", default="models/sign_sequence_model.h5")
+    parser.add_argument("--window", type=int, default=30, help="Frames per window")
+    parser.add_argument("--stride", type=int, default=2, help="Frames between consecutive windows")
+    parser.add_argument("--kernel-size", type=int, default=5)
+    parser.add_argument("--filters", type=int, default=64)
+    parser.add_argument("--epochs", type=int, default=30)
+    args = parser.parse_args()
+
+    from sklearn.model_selection import GroupShuffleSplit, ShuffleSplit
+
+    # Cache groups are recordings: one shard, or one same-label run of the CSV
+    dataset = build_cache(args.data or default_source())
+    windows, window_labels, window_runs = build_windows(dataset.features, dataset.labels.astype(np.int64),
+                                                        dataset.groups, args.window, args.stride)
+    print(f"✅ {len(windows)} windows of {args.window} frames from {len(np.unique(window_runs))} recordings")
+
+    # Split by recording so overlapping windows of one take never end up on both sides,
+    # unless that would leave validation with only signs missing from training
+    groups = window_runs
+    if groups_confounded(window_runs, window_labels):
+        print("⚠️ Each recording holds one sign and each sign one recording, so holding out recordings would "
+              "validate on unseen signs. Falling back to a random window split, which leaks overlapping "
+              "windows into validation; validation accuracy is optimistic.")
+        splitter, groups = ShuffleSplit(n_splits=1, test_size=0.2, random_state=42), None
+    else:
+        splitter = GroupShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
+    train_idx, test_idx = next(splitter.split(windows, window_labels, groups=groups))
+
+    model = build_model(args.window, dataset.num_features, len(labels), args.kernel_size, args.filters)
+    model.fit(windows[train_idx], window_labels[train_idx],
+              validation_data=(windows[test_idx], window_labels[test_idx]),
+              epochs=args.epochs, batch_size=32)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    model.save(args.output)
+    print(f"Sequence model saved as '{args.output}'")
+
+    max_diff = check_streaming(args.output, windows[test_idx][:32], model)
+    print(f"✅ Streaming runner vs Keras: max diff {max_diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()